@@ -0,0 +1,24 @@
+# 대량 평가/사전 계산용 배치 진입점 (rag_llm.py와 같은 서비스 사용)
+# 사용법: python batch_llm.py questions.jsonl > answers.jsonl
+#   입력 한 줄: {"message": "카페 폐업률 알려줘", "category": "startup"} 또는 ["카페 폐업률 알려줘", "startup"]
+# 생성 락을 실시간 /api/chat 요청과 함께 쓰므로, 대량 실행은 별도 인스턴스에서 돌리는 것을 권장
+import sys
+import json
+from services.chat_pipeline import chat_pipeline
+
+def run_batch(items):
+    """(message, category) 목록을 묶어서 처리, 결과 dict를 완료되는 순서대로 yield"""
+    return chat_pipeline.answer_batch(items)
+
+def _read_items(stream):
+    return [json.loads(line) for line in stream if line.strip()]
+
+if __name__ == "__main__":
+    if len(sys.argv) > 1 and sys.argv[1] != "-":
+        with open(sys.argv[1], encoding="utf-8") as f:
+            items = _read_items(f)
+    else:
+        items = _read_items(sys.stdin)
+
+    for result in run_batch(items):
+        print(json.dumps(result, ensure_ascii=False), flush=True)
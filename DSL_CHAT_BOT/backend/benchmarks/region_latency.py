@@ -0,0 +1,76 @@
+"""지역 파티션 수에 따른 질문당 검색 지연 측정
+
+임베딩 모델 없이 임의 임베딩(ko-sroberta 차원)으로 동성로 1개 지역 규모의 파티션을 여러 개 만들고,
+- 파티션 라우팅: 질문의 지역 파티션 1개만 검색 (StartupService 방식)
+- 단일 인덱스: 모든 지역을 한 배열로 합쳐서 검색
+두 경우의 질문당 지연을 비교한다.
+
+실행: python benchmarks/region_latency.py [지역 수 ...]   (기본: 1 2 5 10 20)
+"""
+import os
+import sys
+import time
+import numpy as np
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+from services.region_store import RegionStore
+from utils.vector_search import top_k
+
+DIM = 768          # jhgan/ko-sroberta-multitask 임베딩 차원
+STATS_ROWS = 156   # master_summary_final.csv 행 수
+BIZ_ROWS = 5314    # final_data.csv 행 수
+QUERIES = 200
+
+def make_partition(region, seed):
+    rng = np.random.default_rng(seed)
+    def embeds(n):
+        x = rng.standard_normal((n, DIM), dtype=np.float32)
+        return x / np.linalg.norm(x, axis=1, keepdims=True)
+    return {
+        "stats_corpus": [f"[통계] {region} {i}" for i in range(STATS_ROWS)],
+        "biz_corpus": [f"[사업장] {region} {i}" for i in range(BIZ_ROWS)],
+        "stats_embeds": embeds(STATS_ROWS),
+        "biz_embeds": embeds(BIZ_ROWS)
+    }
+
+def search(data, q_emb):
+    """StartupService.search_context_batch와 같은 검색 (통계 상위 5 + 사업장 상위 3)"""
+    stats_ids, _ = top_k(q_emb, data["stats_embeds"], 5)
+    biz_ids, _ = top_k(q_emb, data["biz_embeds"], 3)
+    return [data["stats_corpus"][i] for i in stats_ids[0]] + [data["biz_corpus"][i] for i in biz_ids[0]]
+
+def per_query_ms(fn, queries):
+    start = time.perf_counter()
+    for args in queries:
+        fn(*args)
+    return (time.perf_counter() - start) * 1000 / len(queries)
+
+def run(n_regions):
+    regions = [f"region{i}" for i in range(n_regions)]
+    partitions = {region: make_partition(region, i) for i, region in enumerate(regions)}
+    store = RegionStore(partitions.get, max_bytes=float("inf"), pinned=regions[:1])
+    for region in regions:
+        store.get(region)  # 로드 비용은 제외하고 검색 지연만 측정
+
+    flat = {
+        key: np.vstack([p[key] for p in partitions.values()]) if key.endswith("embeds")
+        else [t for p in partitions.values() for t in p[key]]
+        for key in ("stats_corpus", "biz_corpus", "stats_embeds", "biz_embeds")
+    }
+
+    rng = np.random.default_rng(0)
+    queries = []
+    for _ in range(QUERIES):
+        q = rng.standard_normal((1, DIM), dtype=np.float32)
+        queries.append((regions[rng.integers(n_regions)], q / np.linalg.norm(q)))
+
+    routed = per_query_ms(lambda region, q: search(store.get(region), q), queries)
+    single = per_query_ms(lambda region, q: search(flat, q), queries)
+    return routed, single, store.total_bytes() / 1024 / 1024
+
+if __name__ == "__main__":
+    counts = [int(arg) for arg in sys.argv[1:]] or [1, 2, 5, 10, 20]
+    print(f"{'지역 수':>6} | {'파티션 라우팅(ms/질문)':>20} | {'단일 인덱스(ms/질문)':>18} | {'로드된 파티션(MB)':>16}")
+    for n in counts:
+        routed, single, loaded_mb = run(n)
+        print(f"{n:>8} | {routed:>24.2f} | {single:>22.2f} | {loaded_mb:>20.1f}")
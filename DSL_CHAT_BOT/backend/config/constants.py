@@ -3,6 +3,43 @@ CATEGORY_STARTUP = "startup"
 CATEGORY_POLICY = "policy"
 CATEGORY_TREND = "trend"
 
+# 모델 라우팅용 작업 이름 (답변 생성은 카테고리 이름을 그대로 사용)
+TASK_LABELING = "labeling"
+TASK_EXTRACTION = "extraction"
+
 # 모델 설정
 MODEL_NAME = "K-intelligence/Midm-2.0-Mini-Instruct"
-EMBEDDING_MODEL = "jhgan/ko-sroberta-multitask"
\ No newline at end of file
+EMBEDDING_MODEL = "jhgan/ko-sroberta-multitask"
+
+# 지역 파티션 (대구/경북). 지역명 → 안내용 이름, 질문에서 찾을 별칭
+# 별칭은 단어 시작 위치에서만 매칭 (강남구의 '남구' 방지). 일반 단어와 겹치거나(화원, 경주, 구미, 다사, 성서)
+# 다른 시·도에도 있는 이름(중구, 동구, 서구, 남구, 북구)은 '대구 ○구', '○○시/군/읍'처럼 구분되는 형태로만 등록
+REGIONS = {
+    "동성로": {"label": "대구 동성로", "aliases": ["동성로", "대구 중구", "반월당", "삼덕동"]},
+    "동구": {"label": "대구 동구", "aliases": ["대구 동구", "동대구", "신천동"]},
+    "서구": {"label": "대구 서구", "aliases": ["대구 서구", "평리동"]},
+    "남구": {"label": "대구 남구", "aliases": ["대구 남구", "대명동"]},
+    "북구": {"label": "대구 북구", "aliases": ["대구 북구", "칠곡지구", "복현동"]},
+    "수성구": {"label": "대구 수성구", "aliases": ["수성구", "수성못", "범어동", "만촌동"]},
+    "달서구": {"label": "대구 달서구", "aliases": ["달서구", "상인동", "월성동"]},
+    "달성군": {"label": "대구 달성군", "aliases": ["달성군", "화원읍", "다사읍", "현풍읍"]},
+    "군위군": {"label": "대구 군위군", "aliases": ["군위군"]},
+    "포항": {"label": "경북 포항", "aliases": ["포항"]},
+    "경주": {"label": "경북 경주", "aliases": ["경주시", "황리단길"]},
+    "김천": {"label": "경북 김천", "aliases": ["김천"]},
+    "안동": {"label": "경북 안동", "aliases": ["안동시"]},
+    "구미": {"label": "경북 구미", "aliases": ["구미시"]},
+    "영주": {"label": "경북 영주", "aliases": ["영주시"]},
+    "영천": {"label": "경북 영천", "aliases": ["영천시"]},
+    "상주": {"label": "경북 상주", "aliases": ["상주시"]},
+    "문경": {"label": "경북 문경", "aliases": ["문경"]},
+    "경산": {"label": "경북 경산", "aliases": ["경산"]},
+    "의성": {"label": "경북 의성", "aliases": ["의성군"]},
+    "청도": {"label": "경북 청도", "aliases": ["청도군"]},
+    "고령": {"label": "경북 고령", "aliases": ["고령군"]},
+    "성주": {"label": "경북 성주", "aliases": ["성주군"]},
+    "칠곡": {"label": "경북 칠곡", "aliases": ["칠곡군", "왜관읍"]},
+    "예천": {"label": "경북 예천", "aliases": ["예천"]},
+    "울진": {"label": "경북 울진", "aliases": ["울진"]},
+    "영덕": {"label": "경북 영덕", "aliases": ["영덕"]}
+}
@@ -1,5 +1,6 @@
 import os
 from dotenv import load_dotenv
+from config.constants import MODEL_NAME, TASK_LABELING, TASK_EXTRACTION, CATEGORY_STARTUP, CATEGORY_POLICY, CATEGORY_TREND
 
 # .env 파일 로드
 load_dotenv()
@@ -23,4 +24,77 @@ DATA_PATHS = {
 NAVER_DATALAB_CONFIG = {
     'client_id': os.getenv('NAVER_CLIENT_ID'),
     'client_secret': os.getenv('NAVER_CLIENT_SECRET')
-}
\ No newline at end of file
+}
+
+# 대화 세션 설정 (멀티턴 + KV 캐시 재사용)
+SESSION_CONFIG = {
+    'max_sessions': int(os.getenv('SESSION_MAX_SESSIONS', 200)),          # 동시에 유지할 최대 세션 수
+    'idle_timeout_sec': int(os.getenv('SESSION_IDLE_TIMEOUT_SEC', 1800)), # 이 시간 동안 요청 없으면 세션 삭제
+    'max_history_turns': int(os.getenv('SESSION_MAX_HISTORY_TURNS', 3)),  # LLM에 다시 넣을 이전 대화 턴 수
+    'max_kv_cache_mb': int(os.getenv('SESSION_MAX_KV_CACHE_MB', 512))     # 프로세스 전체 KV 캐시 상한
+}
+
+
+# 데이터 파일 핫 리로드 설정 (DATA_PATHS 변경 감지 → 백그라운드 재구축 후 교체)
+DATA_RELOAD_CONFIG = {
+    'enabled': os.getenv('DATA_RELOAD_ENABLED', 'true').lower() == 'true',
+    'interval_sec': int(os.getenv('DATA_RELOAD_INTERVAL_SEC', 30))
+}
+
+
+# 생성 마감/취소 및 수용 제어 설정
+GENERATION_CONFIG = {
+    'default_timeout_sec': float(os.getenv('GENERATION_DEFAULT_TIMEOUT_SEC', 120)),  # 요청에 timeout_ms가 없을 때
+    'max_timeout_sec': float(os.getenv('GENERATION_MAX_TIMEOUT_SEC', 300)),
+    'min_new_tokens': int(os.getenv('GENERATION_MIN_NEW_TOKENS', 64)),  # 이보다 적게밖에 못 만들면 거절
+    'disconnect_poll_sec': 0.5
+}
+
+
+# 라벨링과 검색/외부 조회를 병렬로 실행하는 파이프라인 설정
+PIPELINE_CONFIG = {
+    'speculative': os.getenv('PIPELINE_SPECULATIVE', 'true').lower() == 'true',
+    'max_workers': int(os.getenv('PIPELINE_MAX_WORKERS', 4))
+}
+
+
+# 배치 평가 API 설정 (/api/chat/batch, batch_llm.py)
+# 묶음 생성도 실시간 요청과 같은 생성 락/대기 추정에 포함됨. 대량 QA는 별도 인스턴스에서 실행 권장
+BATCH_CONFIG = {
+    'batch_size': int(os.getenv('BATCH_SIZE', 8)),         # 한 번에 묶어서 라벨링/생성할 질문 수
+    'max_items': int(os.getenv('BATCH_MAX_ITEMS', 5000))   # 요청 1건당 최대 질문 수
+}
+
+
+# 카테고리별 프롬프트 토큰 예산 (초과 시 이전 대화/하위 컨텍스트부터 제외)
+PROMPT_BUDGETS = {
+    'startup': int(os.getenv('PROMPT_BUDGET_STARTUP', 1536)),
+    'policy': int(os.getenv('PROMPT_BUDGET_POLICY', 1024)),
+    'trend': int(os.getenv('PROMPT_BUDGET_TREND', 768))
+}
+
+
+# 지역별 데이터 파티션 설정
+# 기본 지역은 DATA_PATHS, 나머지는 data_dir/<지역명>/master_summary_final.csv, final_data.csv
+REGION_CONFIG = {
+    'default_region': '동성로',
+    'data_dir': os.getenv('REGION_DATA_DIR', './data/regions'),
+    'max_partition_mb': int(os.getenv('REGION_MAX_PARTITION_MB', 2048)),  # 로드된 파티션 전체 메모리 상한
+    'preload_default': os.getenv('REGION_PRELOAD_DEFAULT', 'true').lower() == 'true'  # 시작할 때 기본 지역 로드
+}
+
+# 작업별 모델 라우팅 (같은 모델을 가리키는 작업끼리는 가중치 1벌을 공유)
+# 라벨링(알파벳 1글자), 키워드 추출처럼 가벼운 작업은 LIGHT_MODEL_NAME으로 더 작은 로컬 모델 지정 가능
+LIGHT_MODEL_NAME = os.getenv('LIGHT_MODEL_NAME', MODEL_NAME)
+MODEL_ROUTES = {
+    TASK_LABELING: os.getenv('MODEL_LABELING', LIGHT_MODEL_NAME),
+    TASK_EXTRACTION: os.getenv('MODEL_EXTRACTION', LIGHT_MODEL_NAME),
+    CATEGORY_STARTUP: os.getenv('MODEL_STARTUP', MODEL_NAME),
+    CATEGORY_POLICY: os.getenv('MODEL_POLICY', MODEL_NAME),
+    CATEGORY_TREND: os.getenv('MODEL_TREND', MODEL_NAME)
+}
+
+MODEL_REGISTRY_CONFIG = {
+    'max_memory_mb': int(os.getenv('MODEL_MAX_MEMORY_MB', 16384)),  # 로드된 모델 가중치 전체 메모리 상한
+    'preload_tasks': [t for t in os.getenv('MODEL_PRELOAD_TASKS', CATEGORY_STARTUP).split(',') if t]  # 서버 시작 시 미리 로드할 작업
+}
@@ -1,16 +1,20 @@
+import asyncio
+import json
 from fastapi import FastAPI, Request
 from fastapi.middleware.cors import CORSMiddleware
+from fastapi.responses import JSONResponse, StreamingResponse
+from starlette.concurrency import run_in_threadpool
 import uvicorn
 
 from rag_llm import (
-    label_category_with_mini,
-    llm_answer_with_rag,
-    llm_answer_with_policy,
-    llm_answer_with_trend,
-    CATEGORY_STARTUP,
-    CATEGORY_POLICY,
-    CATEGORY_TREND,
+    answer_chat,
+    get_chat_session,
+    chat_session_turn,
 )
+from batch_llm import run_batch
+from models.model_registry import model_registry
+from config.settings import GENERATION_CONFIG, BATCH_CONFIG
+from utils.request_context import RequestContext, GenerationRejected, request_scope
 
 app = FastAPI()
 
@@ -22,34 +26,80 @@ app.add_middleware(
     allow_headers=["*"],
 )
 
+BUSY_REPLY = "지금은 요청이 많아 시간 안에 답변드리기 어려워요. 잠시 후 다시 질문해 주세요."
+
+def _request_timeout(data):
+    """요청에 timeout_ms가 있으면 사용 (서버 최대값으로 제한), 없으면 기본값"""
+    timeout_ms = data.get("timeout_ms")
+    if timeout_ms is None:
+        return GENERATION_CONFIG['default_timeout_sec']
+    try:
+        return min(float(timeout_ms) / 1000, GENERATION_CONFIG['max_timeout_sec'])
+    except (TypeError, ValueError):
+        return GENERATION_CONFIG['default_timeout_sec']
+
+async def _watch_disconnect(request, ctx):
+    """클라이언트가 연결을 끊으면 생성 중단 신호"""
+    while not ctx.cancelled.is_set():
+        if await request.is_disconnected():
+            ctx.cancelled.set()
+            print("⚠️ 클라이언트 연결 끊김 → 생성 중단")
+            break
+        await asyncio.sleep(GENERATION_CONFIG['disconnect_poll_sec'])
+
+def _answer_chat(ctx, question, selected_category, session):
+    """라벨링 → 카테고리별 답변 (워커 스레드에서 실행, 마감/취소는 ctx로 전달)
+    같은 세션의 이전 턴이 끝날 때까지 마감 시간 안에서 기다렸다가 처리하고, 끝나면 세션 commit"""
+    with request_scope(ctx), chat_session_turn(session, timeout=max(ctx.remaining(), 0)):
+        return answer_chat(question, selected_category, session)
+
 @app.post("/api/chat")
 async def chat(request: Request):
     data = await request.json()
     question = data.get("message", "")
     selected_category = data.get("category", None)  # 프론트에서 선택한 카테고리 value (startup, policy, trend 등)
+    session_id = data.get("session_id", None)  # 멀티턴 대화용 세션 id (없으면 단발성 응답)
 
     if not question or not selected_category:
         return {"reply": "질문과 카테고리를 모두 입력해 주세요."} #디버깅용, 실제로는 UI상에서 선택해야 입력이 가능함
 
-    # 믿음 mini로 질문의 실제 카테고리 분류
-    predicted_category = label_category_with_mini(question, selected_category)
+    session = get_chat_session(session_id)
+    ctx = RequestContext(_request_timeout(data))
+
+    # 생성은 워커 스레드에서 돌리고, 이벤트 루프에서는 연결 끊김을 감시
+    watcher = asyncio.create_task(_watch_disconnect(request, ctx))
+    try:
+        answer = await run_in_threadpool(_answer_chat, ctx, question, selected_category, session)
+    except GenerationRejected as e:
+        print(f"⚠️ 요청 거절: {e}")
+        answer = BUSY_REPLY
+    finally:
+        watcher.cancel()
+
+    return {"reply": answer, "session_id": session_id}
+
+@app.post("/api/chat/batch")
+async def chat_batch(request: Request):
+    """QA/사전 계산용: items를 묶어서 처리하고 결과를 JSON Lines로 스트리밍"""
+    data = await request.json()
+    items = data.get("items", [])
+
+    if not isinstance(items, list) or not items:
+        return JSONResponse({"error": "items에 (message, category) 목록을 입력해 주세요."}, status_code=400)
+    if len(items) > BATCH_CONFIG['max_items']:
+        return JSONResponse({"error": f"한 번에 최대 {BATCH_CONFIG['max_items']}건까지 처리할 수 있어요."}, status_code=400)
 
-# 선택과 분류가 다르면 안내
-    if predicted_category == "unknown":
-        return {"reply": "더 공부하는 챗봇이 될게요!"}
+    def stream():
+        # 동기 제너레이터라 StreamingResponse가 워커 스레드에서 순회
+        for result in run_batch(items):
+            yield json.dumps(result, ensure_ascii=False) + "\n"
 
-    # 실제 답변은 BASE 모델 등 카테고리별 LLM에 위임
-    # A와 C가 헷갈리는 경우 사용자 카테고리 우선
-    if selected_category == CATEGORY_STARTUP and predicted_category in [CATEGORY_STARTUP, CATEGORY_TREND]:
-        answer = llm_answer_with_rag(question)
-    elif selected_category == CATEGORY_POLICY and predicted_category == CATEGORY_POLICY:
-        answer = llm_answer_with_policy(question)
-    elif selected_category == CATEGORY_TREND and predicted_category in [CATEGORY_STARTUP, CATEGORY_TREND]:
-        answer = llm_answer_with_trend(question)
-    else:
-        answer = "질문이 현재 선택된 카테고리와 맞지 않아요. 카테고리를 변경해 주세요."
+    return StreamingResponse(stream(), media_type="application/x-ndjson")
 
-    return {"reply": answer}
+@app.get("/api/models")
+async def model_stats():
+    """작업별 배정 모델, 로드 여부, 가중치 메모리, 평균/최근 지연 시간"""
+    return model_registry.report()
 
 if __name__ == "__main__":
-    uvicorn.run("main:app", host="0.0.0.0", port=8000, reload=True)
\ No newline at end of file
+    uvicorn.run("main:app", host="0.0.0.0", port=8000, reload=True)
@@ -1,12 +1,22 @@
-from sentence_transformers import SentenceTransformer
+import threading
 from config.constants import EMBEDDING_MODEL
 
 class EmbeddingModel:
     def __init__(self):
-        self.embedder = SentenceTransformer(EMBEDDING_MODEL)
-    
+        # 실제 모델은 첫 encode 때 로드 (import만으로 가중치를 올리지 않도록)
+        self.embedder = None
+        self._lock = threading.Lock()
+
+    def _load(self):
+        with self._lock:
+            if self.embedder is None:
+                from sentence_transformers import SentenceTransformer
+                self.embedder = SentenceTransformer(EMBEDDING_MODEL)
+        return self.embedder
+
     def encode(self, texts, convert_to_numpy=True, show_progress_bar=False):
-        return self.embedder.encode(texts, convert_to_numpy=convert_to_numpy, show_progress_bar=show_progress_bar)
+        embedder = self.embedder or self._load()
+        return embedder.encode(texts, convert_to_numpy=convert_to_numpy, show_progress_bar=show_progress_bar)
 
 # 전역 인스턴스 (기존 호환성 유지)
-embedding_instance = EmbeddingModel()
\ No newline at end of file
+embedding_instance = EmbeddingModel()
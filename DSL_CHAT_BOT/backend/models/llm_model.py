@@ -1,30 +1,248 @@
+import time
+import threading
 import torch
-from transformers import AutoModelForCausalLM, AutoTokenizer, GenerationConfig
+from transformers import AutoModelForCausalLM, AutoTokenizer, DynamicCache, GenerationConfig, StoppingCriteria, StoppingCriteriaList
 from config.constants import MODEL_NAME
+from config.settings import GENERATION_CONFIG
+from utils.request_context import current_request, GenerationRejected
+
+def load_dtype():
+    """가중치 로드 dtype (GPU는 bf16, CPU는 fp32)"""
+    return torch.bfloat16 if torch.cuda.is_available() else torch.float32
+
+class DeadlineStoppingCriteria(StoppingCriteria):
+    """클라이언트 연결 끊김/마감 시간 초과 시 생성 중단 + 토큰 생성 시각 기록"""
+    def __init__(self, ctx):
+        self.ctx = ctx
+        self.first_token_at = None
+        self.steps = 0
+
+    def __call__(self, input_ids, scores, **kwargs):
+        if self.first_token_at is None:
+            self.first_token_at = time.monotonic()
+        self.steps += 1
+        stop = self.ctx is not None and self.ctx.should_stop()
+        return torch.full((input_ids.shape[0],), stop, dtype=torch.bool, device=input_ids.device)
 
 class LLMModel:
-    def __init__(self):
-        #믿음 미니!!
-        self.model_name = MODEL_NAME
-        self.tokenizer = AutoTokenizer.from_pretrained(self.model_name)
+    def __init__(self, model_name=MODEL_NAME, tokenizer=None):
+        #기본은 믿음 미니!! (작업별 모델은 models/model_registry.py에서 지정)
+        self.model_name = model_name
+        self.tokenizer = tokenizer if tokenizer is not None else AutoTokenizer.from_pretrained(self.model_name)
         self.llm = AutoModelForCausalLM.from_pretrained(
             self.model_name,
-            torch_dtype=torch.bfloat16 if torch.cuda.is_available() else torch.float32,
+            torch_dtype=load_dtype(),
             device_map="auto" if torch.cuda.is_available() else None,
             trust_remote_code=True
         )
         self.gen_config = GenerationConfig.from_pretrained(self.model_name)
-    
-    def generate_response(self, messages, max_new_tokens=512, do_sample=True):
+
+        # 수용 제어용 상태: 생성은 한 번에 하나씩, 처리 속도는 지수이동평균으로 추정
+        self._gen_lock = threading.Lock()
+        self._stats_lock = threading.Lock()
+        self._queued = 0              # 대기 + 실행 중인 생성 요청 수
+        self._pending_sec = 0.0       # 대기 + 실행 중인 요청들의 예상 처리 시간 합
+        self._prefill_sec = None      # 입력 토큰 1개당 prefill 시간
+        self._decode_sec = None       # 생성 토큰 1개당 시간
+
+    def generate_response(self, messages, max_new_tokens=512, do_sample=True, kv_state=None):
+        """kv_state(dict)를 넘기면 이전 턴의 past_key_values를 재사용하고, 생성 후 최신 캐시로 갱신"""
         input_ids = self.tokenizer.apply_chat_template(
             messages, tokenize=True, add_generation_prompt=True, return_tensors="pt"
         ).to(self.llm.device)
-        output = self.llm.generate(
-            input_ids, generation_config=self.gen_config, 
-            max_new_tokens=max_new_tokens, do_sample=do_sample
-        )
-        response = self.tokenizer.decode(output[0][input_ids.shape[-1]:], skip_special_tokens=True)
+
+        ctx = current_request()
+        self._check_queue(ctx, input_ids.shape[-1], max_new_tokens)
+        # 라벨링(4토큰)과 답변(512토큰)은 걸리는 시간이 크게 다르므로 요청마다 자기 길이로 추정
+        estimate = self.estimate_sec(input_ids.shape[-1], max_new_tokens)
+        self._enqueue(estimate)
+        try:
+            with self._gen_lock:
+                past_key_values = self._prepare_cache(kv_state, input_ids)
+                cached_len = past_key_values.get_seq_length() if past_key_values is not None else 0
+                prompt_len = input_ids.shape[-1] - cached_len
+                max_new_tokens = self._admit(ctx, prompt_len, max_new_tokens)
+
+                stopper = DeadlineStoppingCriteria(ctx)
+                started = time.monotonic()
+                output = self.llm.generate(
+                    input_ids, attention_mask=torch.ones_like(input_ids),
+                    generation_config=self.gen_config,
+                    max_new_tokens=max_new_tokens, do_sample=do_sample,
+                    past_key_values=past_key_values,
+                    return_dict_in_generate=True,
+                    stopping_criteria=StoppingCriteriaList([stopper])
+                )
+                self._record_timing(started, stopper, prompt_len)
+                sequences = output.sequences
+                # 캐시 객체는 다음 generate가 crop/갱신하므로 토큰 기록까지 락 안에서 함께 저장
+                if kv_state is not None:
+                    self._save_cache(kv_state, sequences, output.past_key_values)
+        finally:
+            self._dequeue(estimate)
+
+        response = self.tokenizer.decode(sequences[0][input_ids.shape[-1]:], skip_special_tokens=True)
         return response.strip()
 
-# 전역 인스턴스
-llm_instance = LLMModel()
\ No newline at end of file
+    def generate_batch(self, messages_list, max_new_tokens=512, do_sample=True):
+        """여러 대화를 왼쪽 패딩으로 묶어 한 번의 generate로 처리 (배치 평가용, KV 캐시 재사용 없음)"""
+        if not messages_list:
+            return []
+        encoded = [
+            self.tokenizer.apply_chat_template(messages, tokenize=True, add_generation_prompt=True)
+            for messages in messages_list
+        ]
+        pad_id = self.tokenizer.pad_token_id if self.tokenizer.pad_token_id is not None else self.tokenizer.eos_token_id
+        max_len = max(len(ids) for ids in encoded)
+        input_ids = torch.full((len(encoded), max_len), pad_id, dtype=torch.long)
+        attention_mask = torch.zeros((len(encoded), max_len), dtype=torch.long)
+        for i, ids in enumerate(encoded):
+            input_ids[i, max_len - len(ids):] = torch.tensor(ids, dtype=torch.long)
+            attention_mask[i, max_len - len(ids):] = 1
+
+        ctx = current_request()
+        # 묶음 전체가 락을 잡는 동안 뒤에 온 요청이 기다리므로, 대기 추정에는 요청 len(encoded)건으로 반영
+        estimate = sum(self.estimate_sec(len(ids), max_new_tokens) for ids in encoded)
+        self._enqueue(estimate)
+        try:
+            with self._gen_lock:
+                stopper = DeadlineStoppingCriteria(ctx)
+                started = time.monotonic()
+                output = self.llm.generate(
+                    input_ids.to(self.llm.device), attention_mask=attention_mask.to(self.llm.device),
+                    generation_config=self.gen_config,
+                    max_new_tokens=max_new_tokens, do_sample=do_sample,
+                    pad_token_id=pad_id,
+                    stopping_criteria=StoppingCriteriaList([stopper])
+                )
+                # prefill은 패딩 포함 전체 토큰 기준, 디코딩은 묶음 한 스텝 기준으로 기록 (단건보다 약간 크게 잡힘)
+                self._record_timing(started, stopper, input_ids.numel())
+        finally:
+            self._dequeue(estimate)
+
+        return [
+            self.tokenizer.decode(row[max_len:], skip_special_tokens=True).strip()
+            for row in output
+        ]
+
+    def _admit(self, ctx, prompt_len, max_new_tokens):
+        """마감까지 남은 시간으로 생성 가능한 토큰 수를 추정해서 그대로/축소/거절 결정"""
+        if ctx is None:
+            return max_new_tokens
+        if ctx.cancelled.is_set():
+            raise GenerationRejected("클라이언트 연결이 끊긴 요청")
+        if self._decode_sec is None:
+            return max_new_tokens  # 아직 측정값이 없으면 그대로 수용
+
+        # 락을 잡은 시점이라 앞선 대기 시간은 이미 remaining에 반영됨
+        budget = ctx.remaining() - prompt_len * (self._prefill_sec or 0.0)
+        affordable = int(budget / self._decode_sec) if budget > 0 else 0
+        if affordable >= max_new_tokens:
+            return max_new_tokens
+        if affordable >= min(max_new_tokens, GENERATION_CONFIG['min_new_tokens']):
+            print(f"⚠️ 마감 임박: max_new_tokens {max_new_tokens} → {affordable} (대기 {self._queued - 1}건)")
+            return affordable
+        raise GenerationRejected(f"남은 시간 {ctx.remaining():.1f}초로는 생성 불가 (대기 {self._queued - 1}건)")
+
+    def _check_queue(self, ctx, prompt_len, max_new_tokens):
+        """대기열에 들어가기 전에, 앞선 요청을 기다린 뒤 최소 토큰도 못 만들 요청은 바로 거절"""
+        if ctx is None or self._decode_sec is None:
+            return
+        if ctx.cancelled.is_set():
+            raise GenerationRejected("클라이언트 연결이 끊긴 요청")
+        min_sec = self.estimate_sec(prompt_len, min(max_new_tokens, GENERATION_CONFIG['min_new_tokens']))
+        wait = self.estimated_wait_sec()
+        if ctx.remaining() - wait < min_sec:
+            raise GenerationRejected(f"대기열 {self._queued}건, 예상 대기 {wait:.1f}초로 마감 초과")
+
+    def estimate_sec(self, prompt_len, max_new_tokens):
+        """입력 prompt_len 토큰 prefill + max_new_tokens 생성에 걸릴 예상 시간 (측정값이 없으면 0)"""
+        with self._stats_lock:
+            return prompt_len * (self._prefill_sec or 0.0) + max_new_tokens * (self._decode_sec or 0.0)
+
+    def estimated_wait_sec(self):
+        """지금 들어온 요청이 생성을 시작하기까지 예상 대기 시간 (앞선 요청들의 예상 시간 합)"""
+        with self._stats_lock:
+            return self._pending_sec
+
+    def _enqueue(self, estimate):
+        with self._stats_lock:
+            self._queued += 1
+            self._pending_sec += estimate
+
+    def _dequeue(self, estimate):
+        with self._stats_lock:
+            self._queued -= 1
+            self._pending_sec = max(0.0, self._pending_sec - estimate)
+
+    def _record_timing(self, started, stopper, prompt_len, alpha=0.2):
+        finished = time.monotonic()
+        ewma = lambda old, new: new if old is None else (1 - alpha) * old + alpha * new
+        with self._stats_lock:
+            if stopper.first_token_at is None:
+                return
+            # 첫 토큰까지 = prefill, 이후 = 토큰당 디코딩
+            if prompt_len > 0:
+                self._prefill_sec = ewma(self._prefill_sec, (stopper.first_token_at - started) / prompt_len)
+            if stopper.steps > 1:
+                self._decode_sec = ewma(self._decode_sec, (finished - stopper.first_token_at) / (stopper.steps - 1))
+            elif self._decode_sec is None:
+                self._decode_sec = self._prefill_sec
+
+    def _prepare_cache(self, kv_state, input_ids):
+        """재사용할 캐시, 없으면 빈 DynamicCache (None을 넘기면 generate가 튜플 캐시를 돌려줘서 다음 턴에 재사용 불가)"""
+        if kv_state is None:
+            return None
+        cache = self._reusable_cache(kv_state, input_ids)
+        return cache if cache is not None else DynamicCache()
+
+    def _reusable_cache(self, kv_state, input_ids):
+        """이전 턴 토큰과 이번 입력의 공통 접두부까지만 캐시를 잘라서 반환 (없으면 None)"""
+        cache = kv_state.get("past_key_values")
+        cached_ids = kv_state.get("token_ids")
+        if cache is None or cached_ids is None or not hasattr(cache, "crop"):
+            return None
+        # 다른 모델이 만든 캐시는 재사용 불가 (작업별 모델 라우팅이 바뀐 경우)
+        if kv_state.get("model") != self.model_name:
+            return None
+
+        # 새 입력 토큰이 최소 1개는 남아야 generate가 prefill 가능
+        n = min(cached_ids.shape[-1], input_ids.shape[-1] - 1)
+        if n <= 0:
+            return None
+        mismatch = torch.nonzero(cached_ids[:n].to(input_ids.device) != input_ids[0, :n])
+        prefix_len = int(mismatch[0][0]) if len(mismatch) > 0 else n
+        if prefix_len == 0:
+            return None
+
+        cache.crop(prefix_len)
+        return cache
+
+    def _save_cache(self, kv_state, sequences, cache):
+        if cache is None or not hasattr(cache, "get_seq_length"):
+            self.clear_cache(kv_state)
+            return
+        # 마지막 생성 토큰은 forward 되지 않았으므로 캐시 길이만큼만 토큰 기록
+        cache_len = cache.get_seq_length()
+        kv_state["past_key_values"] = cache
+        kv_state["token_ids"] = sequences[0, :cache_len].detach()
+        kv_state["nbytes"] = self.cache_nbytes(cache)
+        kv_state["model"] = self.model_name
+
+    def memory_nbytes(self):
+        """모델 가중치(파라미터 + 버퍼) 메모리"""
+        return self.llm.get_memory_footprint()
+
+    @staticmethod
+    def cache_nbytes(cache):
+        total = 0
+        for layer in list(getattr(cache, "key_cache", [])) + list(getattr(cache, "value_cache", [])):
+            total += layer.numel() * layer.element_size()
+        return total
+
+    @staticmethod
+    def clear_cache(kv_state):
+        kv_state["past_key_values"] = None
+        kv_state["token_ids"] = None
+        kv_state["nbytes"] = 0
+        kv_state["model"] = None
@@ -0,0 +1,186 @@
+import gc
+import os
+import glob
+import time
+import threading
+from collections import OrderedDict, Counter
+import torch
+from huggingface_hub import get_safetensors_metadata
+from safetensors import safe_open
+from transformers import AutoTokenizer
+from config.settings import MODEL_ROUTES, MODEL_REGISTRY_CONFIG
+from models.llm_model import LLMModel, load_dtype
+
+class TaskModel:
+    """작업 이름으로 모델을 빌려 쓰는 핸들 (서비스는 LLMModel 대신 이걸 들고 있음). 실제 모델은 첫 호출 때 로드"""
+    def __init__(self, registry, task):
+        self.registry = registry
+        self.task = task
+
+    @property
+    def model_name(self):
+        return self.registry.routes[self.task]
+
+    @property
+    def tokenizer(self):
+        # 토큰 수 계산(프롬프트 예산)은 가중치 로드 없이 토크나이저만 사용
+        return self.registry.tokenizer(self.model_name)
+
+    def generate_response(self, messages, **kwargs):
+        return self.registry.run(self.task, "generate_response", messages, **kwargs)
+
+    def generate_batch(self, messages_list, **kwargs):
+        return self.registry.run(self.task, "generate_batch", messages_list, **kwargs)
+
+
+class ModelRegistry:
+    def __init__(self):
+        self.routes = MODEL_ROUTES
+        self.max_bytes = MODEL_REGISTRY_CONFIG['max_memory_mb'] * 1024 * 1024
+        self._models = OrderedDict()  # 모델 이름 → LLMModel (최근 사용 순서, LRU)
+        self._footprints = {}         # 모델 이름 → 가중치 메모리 (한 번 로드해 본 모델은 다시 로드하기 전에 크기를 앎)
+        self._tokenizers = {}
+        self._in_use = Counter()      # 모델 이름 → 생성 중인 호출 수 (사용 중인 모델은 내리지 않음)
+        self._lock = threading.Lock()
+        self._load_locks = {}
+        self._stats = {task: {"calls": 0, "items": 0, "total_sec": 0.0, "last_sec": None} for task in self.routes}
+
+        for task in MODEL_REGISTRY_CONFIG['preload_tasks']:
+            if task in self.routes:
+                self.model(self.routes[task])
+
+    def task(self, task):
+        if task not in self.routes:
+            raise KeyError(f"MODEL_ROUTES에 없는 작업: {task}")
+        return TaskModel(self, task)
+
+    def tokenizer(self, model_name):
+        with self._lock:
+            tokenizer = self._tokenizers.get(model_name)
+        if tokenizer is None:
+            tokenizer = AutoTokenizer.from_pretrained(model_name)
+            with self._lock:
+                tokenizer = self._tokenizers.setdefault(model_name, tokenizer)
+        return tokenizer
+
+    def model(self, model_name):
+        """로드된 모델 반환. 없으면 메모리 상한에 맞게 오래 안 쓴 모델을 내리고 로드"""
+        with self._lock:
+            if model_name in self._models:
+                self._models.move_to_end(model_name)
+                return self._models[model_name]
+            load_lock = self._load_locks.setdefault(model_name, threading.Lock())
+
+        # 같은 모델을 동시에 두 번 로드하지 않도록 모델별로 잠금
+        with load_lock:
+            with self._lock:
+                if model_name in self._models:
+                    self._models.move_to_end(model_name)
+                    return self._models[model_name]
+                incoming = self._footprints.get(model_name)
+            if incoming is None:
+                incoming = self.estimate_nbytes(model_name)
+            # 로드하는 순간 기존 모델 + 새 모델이 함께 올라가므로, 상한을 넘을 것 같으면 먼저 내림
+            with self._lock:
+                self._evict(incoming, keep=model_name)
+
+            started = time.monotonic()
+            model = LLMModel(model_name, tokenizer=self.tokenizer(model_name))
+            nbytes = model.memory_nbytes()
+            with self._lock:
+                self._models[model_name] = model
+                self._footprints[model_name] = nbytes
+                # 추정치와 실제 크기가 다를 수 있으므로 로드 후 한 번 더 확인
+                self._evict(0, keep=model_name)
+            print(f"🧠 모델 로드: {model_name} ({nbytes / 1024 / 1024:.0f}MB, {time.monotonic() - started:.1f}초)")
+            return model
+
+    @staticmethod
+    def estimate_nbytes(model_name):
+        """로드 전 가중치 크기 추정: safetensors 헤더의 파라미터 수 × 로드 dtype 크기 (알 수 없으면 0)"""
+        dtype_bytes = torch.finfo(load_dtype()).bits // 8
+        try:
+            if os.path.isdir(model_name):
+                count = 0
+                for path in glob.glob(os.path.join(model_name, "*.safetensors")):
+                    with safe_open(path, framework="pt") as f:
+                        for key in f.keys():
+                            count += torch.Size(f.get_slice(key).get_shape()).numel()
+            else:
+                count = sum(get_safetensors_metadata(model_name).parameter_count.values())
+            return count * dtype_bytes
+        except Exception as e:
+            print(f"⚠️ 모델 크기 추정 실패, 로드 후 확인: {model_name} ({e})")
+            return 0
+
+    def _evict(self, incoming_bytes, keep):
+        """로드된 모델 + 새로 올릴 모델이 상한을 넘으면 오래 안 쓴 모델부터 내림 (_lock 안에서 호출)"""
+        total = sum(self._footprints[name] for name in self._models) + incoming_bytes
+        evicted = []
+        for name in list(self._models):
+            if total <= self.max_bytes:
+                break
+            if name == keep or self._in_use[name] > 0:
+                continue
+            del self._models[name]
+            total -= self._footprints[name]
+            evicted.append(name)
+
+        for name in evicted:
+            print(f"🗑️ 모델 언로드: {name} ({self._footprints[name] / 1024 / 1024:.0f}MB)")
+        if evicted:
+            gc.collect()
+            if torch.cuda.is_available():
+                torch.cuda.empty_cache()
+        if total > self.max_bytes:
+            print(f"⚠️ 모델 메모리 {total / 1024 / 1024:.0f}MB가 상한 {self.max_bytes / 1024 / 1024:.0f}MB 초과 (사용 중인 모델은 유지)")
+
+    def run(self, task, method, *args, **kwargs):
+        """작업에 배정된 모델로 생성하고 작업별 지연 시간 기록 (대기열 대기 시간 포함)"""
+        model_name = self.routes[task]
+        with self._lock:
+            self._in_use[model_name] += 1
+        try:
+            model = self.model(model_name)
+            started = time.monotonic()
+            result = getattr(model, method)(*args, **kwargs)
+            self._record(task, time.monotonic() - started, len(args[0]) if method == "generate_batch" else 1)
+            return result
+        finally:
+            with self._lock:
+                self._in_use[model_name] -= 1
+
+    def _record(self, task, elapsed, items):
+        with self._lock:
+            stats = self._stats[task]
+            stats["calls"] += 1
+            stats["items"] += items
+            stats["total_sec"] += elapsed
+            stats["last_sec"] = elapsed
+
+    def report(self):
+        """작업별 모델/지연 시간/메모리와 전체 로드된 모델 메모리"""
+        with self._lock:
+            tasks = {}
+            for task, model_name in self.routes.items():
+                stats = self._stats[task]
+                footprint = self._footprints.get(model_name)
+                tasks[task] = {
+                    "model": model_name,
+                    "loaded": model_name in self._models,
+                    "memory_mb": round(footprint / 1024 / 1024, 1) if footprint is not None else None,
+                    "calls": stats["calls"],
+                    "items": stats["items"],
+                    "avg_ms": round(stats["total_sec"] * 1000 / stats["calls"], 1) if stats["calls"] else None,
+                    "last_ms": round(stats["last_sec"] * 1000, 1) if stats["last_sec"] is not None else None
+                }
+            loaded_bytes = sum(self._footprints[name] for name in self._models)
+            return {
+                "tasks": tasks,
+                "loaded_models": list(self._models),
+                "loaded_mb": round(loaded_bytes / 1024 / 1024, 1),
+                "max_memory_mb": round(self.max_bytes / 1024 / 1024, 1)
+            }
+
+# 전역 인스턴스
+model_registry = ModelRegistry()
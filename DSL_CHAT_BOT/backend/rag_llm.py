@@ -4,16 +4,30 @@ from services.labeling import labeling
 from services.startup_service import startup_service
 from services.policy_service import policy_service
 from services.trend_service import trend_service
+from services.session_store import session_store
+from services.chat_pipeline import chat_pipeline
 
 # 기존 함수명 유지 (호환성을 위해)
 def label_category_with_mini(question, category):
     return labeling.label_category_with_mini(question, category)
 
-def llm_answer_with_rag(question, chat_history=None):
-    return startup_service.llm_answer_with_rag(question, chat_history)
+def llm_answer_with_rag(question, session=None):
+    return startup_service.llm_answer_with_rag(question, session)
+
+def get_chat_session(session_id):
+    return session_store.get(session_id)
+
+def commit_chat_session(session):
+    session_store.commit(session)
+
+def chat_session_turn(session, timeout=None):
+    return session_store.turn(session, timeout)
 
 def llm_answer_with_policy(question):
     return policy_service.llm_answer_with_policy(question)
 
 def llm_answer_with_trend(question):
-    return trend_service.llm_answer_with_trend(question)
\ No newline at end of file
+    return trend_service.llm_answer_with_trend(question)
+
+def answer_chat(question, category, session=None):
+    return chat_pipeline.answer(question, category, session)
\ No newline at end of file
@@ -0,0 +1,189 @@
+import contextvars
+from concurrent.futures import ThreadPoolExecutor
+from config.constants import CATEGORY_STARTUP, CATEGORY_POLICY, CATEGORY_TREND
+from config.settings import PIPELINE_CONFIG, BATCH_CONFIG
+from services.labeling import labeling
+from services.startup_service import startup_service
+from services.policy_service import policy_service, NO_POLICY_REPLY
+from services.trend_service import trend_service, NO_TREND_REPLY
+
+class ChatPipeline:
+    def __init__(self):
+        self.speculative = PIPELINE_CONFIG['speculative']
+        self.executor = ThreadPoolExecutor(
+            max_workers=PIPELINE_CONFIG['max_workers'],
+            thread_name_prefix="chat-pipeline"
+        )
+
+    def answer(self, question, selected_category, session=None):
+        """라벨링 → 카테고리별 답변. 사용자가 고른 카테고리의 검색/외부 조회는 라벨링과 동시에 미리 시작"""
+        followup = None
+        if selected_category == CATEGORY_STARTUP:
+            # "더 자세한 조언" → 직전 조회 질문을 LLM 조언 경로로 처리
+            followup = startup_service.advice_followup_question(question, session)
+            question = followup or question
+
+        speculation = self._start_speculation(question, selected_category, session) if self.speculative else None
+
+        target = None
+        try:
+            # 믿음 mini로 질문의 실제 카테고리 분류 (후속 질문은 직전 질문과 함께 판단)
+            label_question = f"{session.last_question} {question}" if session and session.last_question else question
+            predicted_category = labeling.label_category_with_mini(label_question, selected_category)
+            target, reply = self._route(selected_category, predicted_category)
+        finally:
+            # 답변하지 않거나 라벨링이 실패(거절/취소)하면 선행 조회는 버림
+            if target is None:
+                self._discard(speculation)
+        if target is None:
+            return reply
+
+        # 실제 답변은 BASE 모델 등 카테고리별 LLM에 위임
+        if target == CATEGORY_STARTUP:
+            # 단순 통계 조회는 라벨링(대구/경북 밖 지역 거절)만 거치고 512토큰 생성 없이 바로 답변
+            lookup_reply = startup_service.answer_lookup(question, session) if followup is None else None
+            if lookup_reply is not None:
+                self._discard(speculation)
+                return lookup_reply
+            retrieved = self._collect(speculation, CATEGORY_STARTUP)
+            return startup_service.llm_answer_with_rag(question, session, retrieved)
+        elif target == CATEGORY_POLICY:
+            contexts = self._collect(speculation, CATEGORY_POLICY)
+            return policy_service.llm_answer_with_policy(question, contexts)
+        contexts = self._collect(speculation, CATEGORY_TREND)
+        return trend_service.llm_answer_with_trend(question, contexts)
+
+    def _route(self, selected_category, predicted_category):
+        """(답변할 카테고리, None) 또는 답변하지 않을 때 (None, 안내 문구)"""
+        # 선택과 분류가 다르면 안내
+        if predicted_category == "unknown":
+            return None, "더 공부하는 챗봇이 될게요!"
+
+        # A와 C가 헷갈리는 경우 사용자 카테고리 우선
+        if selected_category == CATEGORY_STARTUP and predicted_category in [CATEGORY_STARTUP, CATEGORY_TREND]:
+            return CATEGORY_STARTUP, None
+        elif selected_category == CATEGORY_POLICY and predicted_category == CATEGORY_POLICY:
+            return CATEGORY_POLICY, None
+        elif selected_category == CATEGORY_TREND and predicted_category in [CATEGORY_STARTUP, CATEGORY_TREND]:
+            return CATEGORY_TREND, None
+        return None, "질문이 현재 선택된 카테고리와 맞지 않아요. 카테고리를 변경해 주세요."
+
+    def answer_batch(self, items):
+        """[{"message", "category"}, ...] 또는 [[message, category], ...]를 batch_size씩 묶어 처리하고, 묶음이 끝날 때마다 결과를 yield"""
+        size = BATCH_CONFIG['batch_size']
+        for start in range(0, len(items), size):
+            yield from self._answer_chunk(items[start:start + size], start)
+
+    @staticmethod
+    def _normalize_item(item):
+        """{"message", "category"} 또는 [message, category] 쌍. 그 외 형식은 빈 항목(입력 안내 답변)"""
+        if isinstance(item, dict):
+            return item
+        if isinstance(item, (list, tuple)) and len(item) == 2:
+            return {"message": item[0], "category": item[1]}
+        return {}
+
+    def _answer_chunk(self, chunk, offset):
+        chunk = [self._normalize_item(item) for item in chunk]
+        questions = [str(item.get("message", "") or "") for item in chunk]
+        categories = [item.get("category") for item in chunk]
+        results = [
+            {"index": offset + i, "message": q, "category": c, "predicted_category": None, "reply": None}
+            for i, (q, c) in enumerate(zip(questions, categories))
+        ]
+
+        # 1. 라벨링: 유효한 질문 전체를 한 번의 배치 생성으로
+        valid = []
+        for i in range(len(chunk)):
+            if not (questions[i] and categories[i]):
+                results[i]["reply"] = "질문과 카테고리를 모두 입력해 주세요."
+                continue
+            valid.append(i)
+        labels = labeling.label_categories_batch([questions[i] for i in valid], [categories[i] for i in valid]) if valid else []
+
+        groups = {CATEGORY_STARTUP: [], CATEGORY_POLICY: [], CATEGORY_TREND: []}
+        for i, label in zip(valid, labels):
+            results[i]["predicted_category"] = label
+            target, reply = self._route(categories[i], label)
+            if target is None:
+                results[i]["reply"] = reply
+                continue
+            # 단순 통계 조회는 생성 없이 바로 답변
+            lookup_reply = startup_service.answer_lookup(questions[i]) if target == CATEGORY_STARTUP else None
+            if lookup_reply is not None:
+                results[i]["reply"] = lookup_reply
+            else:
+                groups[target].append(i)
+
+        # 2. 검색: 카테고리별로 질문을 모아 행렬곱 한 번씩
+        pending = []  # (결과 index, llm, messages, max_new_tokens, 정형 출력 prefix)
+        if groups[CATEGORY_STARTUP]:
+            idx = groups[CATEGORY_STARTUP]
+            for i, retrieved in zip(idx, startup_service.retrieve_batch([questions[i] for i in idx])):
+                composed = startup_service.compose_answer(questions[i], retrieved)
+                if composed["reply"] is not None:
+                    results[i]["reply"] = composed["reply"]
+                    continue
+                pending.append((i, startup_service.llm, startup_service.build_messages(composed), 512, composed["header"]))
+        if groups[CATEGORY_POLICY]:
+            idx = groups[CATEGORY_POLICY]
+            for i, contexts in zip(idx, policy_service.search_policy_batch([questions[i] for i in idx])):
+                if not contexts:
+                    results[i]["reply"] = NO_POLICY_REPLY
+                    continue
+                pending.append((i, policy_service.llm, policy_service.fit_messages(questions[i], contexts), 512, ""))
+        if groups[CATEGORY_TREND]:
+            idx = groups[CATEGORY_TREND]
+            for i, contexts in zip(idx, trend_service.fetch_trend_context_batch([questions[i] for i in idx])):
+                if not contexts:
+                    results[i]["reply"] = NO_TREND_REPLY
+                    continue
+                pending.append((i, trend_service.llm, trend_service.fit_messages(questions[i], contexts), 500, ""))
+
+        # 3. 생성: 같은 작업 모델/같은 max_new_tokens끼리 묶어서 배치 생성 (작업별로 지연 시간이 기록되도록 작업 단위로 묶음)
+        batches = {}
+        for entry in pending:
+            batches.setdefault((entry[1].task, entry[3]), []).append(entry)
+        for batch in batches.values():
+            llm, max_new_tokens = batch[0][1], batch[0][3]
+            responses = llm.generate_batch([entry[2] for entry in batch], max_new_tokens=max_new_tokens, do_sample=False)
+            for entry, response in zip(batch, responses):
+                results[entry[0]]["reply"] = entry[4] + response
+
+        return results
+
+    def _start_speculation(self, question, selected_category, session):
+        """선택된 카테고리 기준으로 검색/외부 조회 단계를 백그라운드에서 시작 (category, future) 반환
+
+        트렌드는 키워드 추출에 LLM이 필요하므로, 추출 모델이 라벨링 모델과 다를 때만 미리 시작
+        (같은 모델이면 같은 생성 락을 두고 경쟁해서 추출이 라벨링보다 먼저 실행될 수 있음)
+        """
+        if selected_category == CATEGORY_STARTUP:
+            fn, args = startup_service.retrieve, (question, session)
+        elif selected_category == CATEGORY_POLICY:
+            fn, args = policy_service.search_policy, (question,)
+        elif selected_category == CATEGORY_TREND and trend_service.extractor.model_name != labeling.llm.model_name:
+            fn, args = trend_service.fetch_trend_context, (question,)
+        else:
+            return None
+        # 요청 마감/취소 컨텍스트를 워커 스레드로 전달
+        ctx = contextvars.copy_context()
+        return selected_category, self.executor.submit(ctx.run, fn, *args)
+
+    def _collect(self, speculation, category):
+        """미리 시작한 결과 사용. 없거나 실패했으면 None → 서비스가 직접 다시 조회"""
+        if speculation is None or speculation[0] != category:
+            return None
+        try:
+            return speculation[1].result()
+        except Exception as e:
+            print(f"⚠️ 선행 조회 실패, 다시 조회: {e}")
+            return None
+
+    def _discard(self, speculation):
+        # 아직 시작 전이면 취소, 실행 중이면 결과만 버림
+        if speculation is not None:
+            speculation[1].cancel()
+
+# 전역 인스턴스
+chat_pipeline = ChatPipeline()
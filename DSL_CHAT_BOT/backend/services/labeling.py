@@ -1,12 +1,23 @@
-from config.constants import CATEGORY_STARTUP, CATEGORY_POLICY, CATEGORY_TREND
-from models.llm_model import llm_instance
+from config.constants import CATEGORY_STARTUP, CATEGORY_POLICY, CATEGORY_TREND, TASK_LABELING
+from models.model_registry import model_registry
 
 class QuestionLabeling:
     def __init__(self):
-        self.llm = llm_instance
+        self.llm = model_registry.task(TASK_LABELING)
 
     def label_category_with_mini(self, question, category):
         #라벨링모델 사용
+        messages = self._build_messages(question, category)
+        response = self.llm.generate_response(messages, max_new_tokens=4, do_sample=False)  #차피 알파벳 한글자라서 토큰 작게해서 빠르게 출력
+        return self._parse_label(response)
+
+    def label_categories_batch(self, questions, categories):
+        """여러 질문을 한 번의 배치 생성으로 라벨링"""
+        messages_list = [self._build_messages(q, c) for q, c in zip(questions, categories)]
+        responses = self.llm.generate_batch(messages_list, max_new_tokens=4, do_sample=False)
+        return [self._parse_label(r) for r in responses]
+
+    def _build_messages(self, question, category):
         prompt = (
             "질문: \"{q}\"\n"
             "사용자가 선택한 카테고리: {c}\n"
@@ -16,15 +27,15 @@ class QuestionLabeling:
             "[C] 트렌드 (업종, 아이템, 키워드의 인기·변화·검색량 등)\n"
             "[D] 해당 없음(인삿말,날씨,정치인,인사,전세계트렌드,기타,서울 등)\n"
             "이 질문이 사용자가 선택한 카테고리에 적절하다면 해당카테고리의 알파벳만 출력해. 적절하지 않다면 다른 카테고리의 알파벳만 출력해."
-            "경북, 대구, 중구, 동성로에 해당하지 않는 지역이 언급된 질문과, 날씨, 인물 등에 관련된 질문은 해당없음으로 분류해"
+            "대구(중구, 동성로, 수성구, 달서구 등 모든 구·군), 경북(포항, 경주, 구미, 경산 등 모든 시·군)에 해당하지 않는 지역이 언급된 질문과, 날씨, 인물 등에 관련된 질문은 해당없음으로 분류해"
         ).format(q=question.strip(), c=category)
         messages = [
             {"role": "system", "content": "너는 질문을 카테고리별로 라벨링하는 전문가야."},
             {"role": "user", "content": prompt}
         ]
-        
-        response = self.llm.generate_response(messages, max_new_tokens=4, do_sample=False)  #차피 알파벳 한글자라서 토큰 작게해서 빠르게 출력
-        
+        return messages
+
+    def _parse_label(self, response):
         #응답 바탕으로 카테고리에 맞는 함수 호출
         resp = response.strip().upper()
         if "A" in resp:
@@ -3,13 +3,18 @@ import xml.etree.ElementTree as ET
 import pandas as pd
 import numpy as np
 from models.embedding_model import embedding_instance
-from models.llm_model import llm_instance
+from models.model_registry import model_registry
+from utils.prompt_budget import prompt_budget
+from utils.vector_search import top_k
 from config.settings import SERVICE_KEY, POLICY_API_URLS
+from config.constants import CATEGORY_POLICY
+
+NO_POLICY_REPLY = "죄송하지만 적절한 데이터를 찾지 못했어요. 다른 질문을 해보시는건 어떨까요?"
 
 class PolicyService:
     def __init__(self):
         self.embedder = embedding_instance
-        self.llm = llm_instance
+        self.llm = model_registry.task(CATEGORY_POLICY)
         self.policy_corpus = []
         self.policy_embeds = np.array([])
         self._load_policy_data()
@@ -44,18 +49,44 @@ class PolicyService:
             self.policy_corpus = []
             self.policy_embeds = np.array([])
     
-    def llm_answer_with_policy(self, question):
-        """URL 포함 정책 질의응답 (데이터 내 URL 정확 출력)"""
+    def search_policy(self, question):
+        """유사도 상위 정책 검색 (LLM 호출 없음)"""
+        return self.search_policy_batch([question])[0]
+
+    def search_policy_batch(self, questions):
+        """여러 질문을 한 번에 임베딩하고 행렬곱 1회로 정책 검색"""
         if len(self.policy_corpus) == 0:
-            return "죄송하지만 적절한 데이터를 찾지 못했어요. 다른 질문을 해보시는건 어떨까요?"
-        q_emb = self.embedder.encode(question, convert_to_numpy=True)
-        sims = np.dot(self.policy_embeds, q_emb)
-        top_ids = sims.argsort()[-5:][::-1]
-        contexts = [self.policy_corpus[i] for i in top_ids if sims[i] > 0.25]
+            return [[] for _ in questions]
+        q_embs = self.embedder.encode(questions, convert_to_numpy=True)
+        top_ids, sims = top_k(q_embs, self.policy_embeds, 5)
+        return [
+            [self.policy_corpus[i] for i in ids if row_sims[i] > 0.25]
+            for ids, row_sims in zip(top_ids, sims)
+        ]
+
+    def llm_answer_with_policy(self, question, contexts=None):
+        """URL 포함 정책 질의응답 (데이터 내 URL 정확 출력)"""
+        if contexts is None:
+            contexts = self.search_policy(question)
         
         if not contexts:
-            return "죄송하지만 적절한 데이터를 찾지 못했어요. 다른 질문을 해보시는건 어떨까요?"
+            return NO_POLICY_REPLY
 
+        messages = self.fit_messages(question, contexts)
+        response = self.llm.generate_response(
+            messages,
+            max_new_tokens=512,
+            do_sample=False
+        )
+        
+        return response
+
+    def fit_messages(self, question, contexts):
+        """토큰 예산을 넘으면 유사도 낮은 컨텍스트부터 제외"""
+        messages, _ = prompt_budget.fit(self.llm, "policy", lambda kept: self.build_messages(question, kept), contexts)
+        return messages
+
+    def build_messages(self, question, contexts):
         prompt = (
             f"현재: 2025년 8월, 대구 창업 정책 상담사\\n\\n"
             
@@ -97,14 +128,7 @@ class PolicyService:
             },
             {"role": "user", "content": prompt}
         ]
-        
-        response = self.llm.generate_response(
-            messages,
-            max_new_tokens=512,
-            do_sample=False
-        )
-        
-        return response
+        return messages
 
 
 # 전역 인스턴스
@@ -0,0 +1,73 @@
+import threading
+from collections import OrderedDict
+
+class RegionStore:
+    """지역별 파티션(코퍼스/임베딩/업종 인덱스 스냅샷)을 처음 요청될 때 로드하고,
+    전체 메모리가 상한을 넘으면 가장 오래 안 쓴 파티션부터 내림 (pinned 지역은 유지)"""
+    def __init__(self, loader, max_bytes, pinned=()):
+        self.loader = loader            # region -> 스냅샷 dict (데이터가 없는 지역이면 None)
+        self.max_bytes = max_bytes
+        self.pinned = set(pinned)
+        self._partitions = OrderedDict()  # 최근 사용 순서 유지 (LRU)
+        self._sizes = {}
+        self._lock = threading.Lock()
+        self._load_locks = {}           # 같은 지역을 동시에 두 번 로드하지 않도록
+
+    def get(self, region):
+        with self._lock:
+            if region in self._partitions:
+                self._partitions.move_to_end(region)
+                return self._partitions[region]
+            load_lock = self._load_locks.setdefault(region, threading.Lock())
+
+        with load_lock:
+            with self._lock:
+                if region in self._partitions:
+                    return self._partitions[region]
+            snapshot = self.loader(region)
+            if snapshot is None:
+                return None
+            with self._lock:
+                self._put(region, snapshot)
+            return snapshot
+
+    def replace(self, region, snapshot):
+        """핫 리로드: 로드되어 있는 파티션만 새 스냅샷으로 교체"""
+        with self._lock:
+            if region in self._partitions:
+                self._put(region, snapshot)
+
+    def items(self):
+        with self._lock:
+            return list(self._partitions.items())
+
+    def total_bytes(self):
+        with self._lock:
+            return sum(self._sizes.values())
+
+    def _put(self, region, snapshot):
+        self._partitions[region] = snapshot
+        self._partitions.move_to_end(region)
+        self._sizes[region] = self.partition_nbytes(snapshot)
+        self._evict(keep=region)
+
+    def _evict(self, keep):
+        total = sum(self._sizes.values())
+        for region in list(self._partitions):
+            if total <= self.max_bytes:
+                break
+            if region == keep or region in self.pinned:
+                continue
+            total -= self._sizes.pop(region)
+            del self._partitions[region]
+            print(f"🧹 [{region}] 파티션 해제 (메모리 상한 초과)")
+
+    @staticmethod
+    def partition_nbytes(snapshot):
+        """임베딩 배열 + 코퍼스 문자열 크기 (대략)"""
+        total = 0
+        for key in ("stats_embeds", "biz_embeds"):
+            total += getattr(snapshot.get(key), "nbytes", 0)
+        for key in ("stats_corpus", "biz_corpus"):
+            total += sum(len(text.encode("utf-8")) for text in snapshot.get(key, []))
+        return total
@@ -0,0 +1,122 @@
+import time
+import threading
+from collections import OrderedDict
+from contextlib import contextmanager
+from config.settings import SESSION_CONFIG
+from utils.request_context import GenerationRejected
+
+class ChatSession:
+    def __init__(self, session_id):
+        self.session_id = session_id
+        self.history = []          # LLM에 실제로 보냈던 user/assistant 메시지 (턴 순서대로)
+        self.last_question = ""    # 후속 질문 라벨링용 직전 질문
+        self.last_sector = "NULL"  # 후속 질문에서 업종이 생략됐을 때 사용
+        self.last_region = None    # 후속 질문에서 지역이 생략됐을 때 사용
+        self.pending_advice = None  # LLM 없이 답한 통계 조회 질문 ("더 자세한 조언" 요청 시 사용)
+        self.kv_state = {"past_key_values": None, "token_ids": None, "nbytes": 0, "model": None}
+        self.last_access = time.time()
+        self.turn_lock = threading.Lock()  # 같은 세션의 턴은 한 번에 하나씩 (재전송 요청과 겹치지 않도록)
+
+    def recent_history(self, max_turns):
+        """최근 max_turns 턴(user+assistant 쌍)만 반환"""
+        return self.history[-2 * max_turns:] if max_turns > 0 else []
+
+    def add_turn(self, question, user_content, assistant_content, sector="NULL", region=None):
+        self.history.append({"role": "user", "content": user_content})
+        self.history.append({"role": "assistant", "content": assistant_content})
+        self.last_question = question
+        if sector != "NULL":
+            self.last_sector = sector
+        if region:
+            self.last_region = region
+
+    def note_lookup(self, question, sector, region=None):
+        """LLM 없이 답한 조회 턴: 히스토리/KV 캐시는 그대로 두고 후속 질문용 정보만 기록"""
+        self.last_question = question
+        self.last_sector = sector
+        if region:
+            self.last_region = region
+        self.pending_advice = question
+
+
+class SessionStore:
+    def __init__(self):
+        self.max_sessions = SESSION_CONFIG['max_sessions']
+        self.idle_timeout = SESSION_CONFIG['idle_timeout_sec']
+        self.max_history_turns = SESSION_CONFIG['max_history_turns']
+        self.max_kv_bytes = SESSION_CONFIG['max_kv_cache_mb'] * 1024 * 1024
+        self._sessions = OrderedDict()  # 최근 사용 순서 유지 (LRU)
+        self._lock = threading.Lock()
+
+    def get(self, session_id):
+        """세션 조회 (없으면 생성). session_id가 없으면 None → 기존처럼 단발성 응답"""
+        if not session_id:
+            return None
+        with self._lock:
+            self._evict_idle()
+            session = self._sessions.pop(session_id, None)
+            if session is None:
+                session = ChatSession(session_id)
+            session.last_access = time.time()
+            self._sessions[session_id] = session
+
+            # 세션 수 상한 초과 시 가장 오래 안 쓴 세션부터 삭제
+            while len(self._sessions) > self.max_sessions:
+                self._sessions.popitem(last=False)
+            return session
+
+    def commit(self, session):
+        """턴 종료 후 히스토리 길이와 전체 KV 캐시 메모리 상한 적용"""
+        if session is None:
+            return
+        with self._lock:
+            # 히스토리가 상한보다 길어지면 앞부분을 버림 (캐시는 다음 턴에서 공통 접두부만 재사용됨)
+            keep = 2 * self.max_history_turns
+            if len(session.history) > keep:
+                session.history = session.history[-keep:] if keep > 0 else []
+            self._enforce_kv_limit()
+
+    @contextmanager
+    def turn(self, session, timeout=None):
+        """세션의 턴 하나를 직렬화: 이전 턴이 끝날 때까지 기다렸다가 처리하고, 끝나면 commit.
+        timeout 안에 이전 턴이 끝나지 않으면 GenerationRejected"""
+        if session is None:
+            yield session
+            return
+        acquired = session.turn_lock.acquire(timeout=timeout) if timeout is not None else session.turn_lock.acquire()
+        if not acquired:
+            raise GenerationRejected("같은 세션의 이전 요청이 아직 처리 중")
+        try:
+            yield session
+        finally:
+            try:
+                self.commit(session)
+            finally:
+                session.turn_lock.release()
+
+    def _evict_idle(self):
+        now = time.time()
+        expired = [sid for sid, s in self._sessions.items() if now - s.last_access > self.idle_timeout]
+        for sid in expired:
+            del self._sessions[sid]
+
+    def _enforce_kv_limit(self):
+        total = sum(s.kv_state["nbytes"] for s in self._sessions.values())
+        if total <= self.max_kv_bytes:
+            return
+        # 오래된 세션의 KV 캐시부터 해제 (대화 히스토리는 유지)
+        for session in self._sessions.values():
+            if total <= self.max_kv_bytes:
+                break
+            if session.turn_lock.locked():
+                continue  # 턴 처리 중인 세션의 캐시는 건드리지 않음
+            if session.kv_state["nbytes"] > 0:
+                total -= session.kv_state["nbytes"]
+                session.kv_state.update({"past_key_values": None, "token_ids": None, "nbytes": 0, "model": None})
+
+    def total_kv_bytes(self):
+        with self._lock:
+            return sum(s.kv_state["nbytes"] for s in self._sessions.values())
+
+# 전역 인스턴스
+session_store = SessionStore()
@@ -1,75 +1,323 @@
 import pandas as pd
 import numpy as np
 import re
+import os
+import time
+import threading
 from collections import Counter
 from models.embedding_model import embedding_instance
-from models.llm_model import llm_instance
+from models.model_registry import model_registry
 from utils.text_processor import text_processor
-from config.settings import DATA_PATHS
+from utils.prompt_budget import prompt_budget
+from utils.request_context import GenerationRejected
+from utils.vector_search import top_k
+from utils.region_matcher import match_region, mentioned_regions
+from utils.lookup_parser import parse_lookup
+from services.region_store import RegionStore
+from config.constants import EMBEDDING_MODEL, REGIONS, CATEGORY_STARTUP
+from config.settings import DATA_PATHS, SESSION_CONFIG, DATA_RELOAD_CONFIG, REGION_CONFIG
 
 class StartupService:
+    # 통계 조회 답변 뒤 LLM 조언을 이어서 요청하는 문구
+    ADVICE_FOLLOWUP = "더 자세한 조언"
+
     def __init__(self):
         self.embedder = embedding_instance
-        self.llm = llm_instance
+        self.llm = model_registry.task(CATEGORY_STARTUP)
         self.text_processor = text_processor
-        self.stats_corpus = []  # 통계 데이터 전용
-        self.biz_corpus = []    # 사업장 데이터 전용
-        self.stats_embeds = None
-        self.biz_embeds = None
-        self._load_data()
-    
-    def _load_data(self):
+        self.default_region = REGION_CONFIG['default_region']
+        # 지역별로 코퍼스/임베딩/업종 인덱스를 하나의 스냅샷으로 묶어서 보관 (핫 리로드 시 참조 1개만 교체)
+        self.regions = RegionStore(
+            self._load_region,
+            REGION_CONFIG['max_partition_mb'] * 1024 * 1024,
+            pinned=[self.default_region]
+        )
+        self._reload_lock = threading.Lock()
+        if REGION_CONFIG['preload_default']:
+            self.regions.get(self.default_region)  # 기본 지역은 시작할 때 로드
+        if DATA_RELOAD_CONFIG['enabled']:
+            self._start_watcher()
+
+    @property
+    def _data(self):
+        """기본 지역 스냅샷"""
+        return self.regions.get(self.default_region)
+
+    # 기존 속성 접근 호환용 (항상 기본 지역의 현재 스냅샷 기준)
+    @property
+    def stats_corpus(self):
+        return self._data["stats_corpus"]
+
+    @property
+    def biz_corpus(self):
+        return self._data["biz_corpus"]
+
+    @property
+    def stats_embeds(self):
+        return self._data["stats_embeds"]
+
+    @property
+    def biz_embeds(self):
+        return self._data["biz_embeds"]
+
+    def _empty_snapshot(self, paths=None):
+        return {
+            "stats_corpus": [],   # 통계 데이터 전용
+            "biz_corpus": [],     # 사업장 데이터 전용
+            "stats_embeds": np.array([]),
+            "biz_embeds": np.array([]),
+            "sector_stats": {},   # 업종 → 통계 문장 (최신 연도순)
+            "sector_biz": {},     # 업종 → 사업장 문장
+            "sector_summary": {}, # 업종 → 프롬프트용 압축 통계 요약
+            "sector_table": {},   # 업종 → 연도 → 지표값 (LLM 없는 통계 조회용)
+            "paths": paths,       # 이 스냅샷을 만든 CSV 경로
+            "signature": None     # 로드 당시 CSV 파일 상태 (mtime, size)
+        }
+
+    def region_paths(self, region):
+        """지역 데이터 파일 경로. 데이터가 없는 지역이면 None"""
+        if region == self.default_region:
+            return DATA_PATHS
+        if region not in REGIONS:
+            return None
+        region_dir = os.path.join(REGION_CONFIG['data_dir'], region)
+        paths = {
+            'startup_data': os.path.join(region_dir, 'master_summary_final.csv'),
+            'business_data': os.path.join(region_dir, 'final_data.csv')
+        }
+        return paths if os.path.exists(paths['startup_data']) else None
+
+    def available_regions(self):
+        return [region for region in REGIONS if self.region_paths(region) is not None]
+
+    def detect_region(self, question, session=None):
+        """질문에 언급된 지역 (겹치면 더 긴 별칭 우선). 없으면 직전 턴 지역 → 기본 지역"""
+        region = match_region(question)
+        if region is not None:
+            return region
+        if session is not None and session.last_region:
+            return session.last_region
+        return self.default_region
+
+    def region_label(self, region):
+        return REGIONS.get(region, {}).get("label", region)
+
+    def _load_region(self, region):
+        paths = self.region_paths(region)
+        if paths is None:
+            return None
         try:
-            # 1. 통계 데이터 로드
-            df_stats = pd.read_csv(DATA_PATHS['startup_data'], encoding="utf-8")
-            self.stats_corpus = [self.text_processor.row_to_text(row) for _, row in df_stats.iterrows()]
-            
-            # 2. 사업장 데이터 로드 (헤더 스킵)
-            df_biz = pd.read_csv(DATA_PATHS['business_data'], encoding="utf-8", header=None)
-            self.biz_corpus = [self.text_processor.business_row_to_text(row) for idx, row in df_biz.iterrows() if idx > 0]
-            
-            # 3. 분리 임베딩 생성
-            print("통계 데이터 임베딩 생성 중...")
-            self.stats_embeds = self.embedder.encode(
-                self.stats_corpus, 
-                convert_to_numpy=True,
-                show_progress_bar=True
-            )
-            
-            print("사업장 데이터 임베딩 생성 중...")
-            self.biz_embeds = self.embedder.encode(
-                self.biz_corpus,
-                convert_to_numpy=True,
-                show_progress_bar=True
+            # 디스크 임베딩 캐시가 있으면 바뀐 행만 임베딩 (파티션 해제 후 재로드도 빠르게)
+            snapshot = self._build_snapshot(paths, previous=self._read_embedding_cache(paths))
+            self._write_embedding_cache(snapshot)
+            print(f"✔️ [{region}] 임베딩 생성 완료")
+            return snapshot
+        except Exception as e:
+            print(f"❌ [{region}] 데이터 로드 오류: {e}")
+            # 최후의 수단: 빈 데이터로 초기화
+            return self._empty_snapshot(paths)
+
+    def _embedding_cache_path(self, paths):
+        return os.path.join(os.path.dirname(paths['startup_data']), ".embeddings_cache.npz")
+
+    def _read_embedding_cache(self, paths):
+        cache_path = self._embedding_cache_path(paths)
+        if not os.path.exists(cache_path):
+            return None
+        try:
+            with np.load(cache_path) as cache:
+                if str(cache["model"]) != EMBEDDING_MODEL:
+                    return None
+                previous = self._empty_snapshot(paths)
+                for key in ("stats_corpus", "biz_corpus"):
+                    previous[key] = cache[key].tolist()
+                for key in ("stats_embeds", "biz_embeds"):
+                    previous[key] = cache[key]
+                return previous
+        except Exception as e:
+            print(f"⚠️ 임베딩 캐시 읽기 실패 ({cache_path}): {e}")
+            return None
+
+    def _write_embedding_cache(self, snapshot):
+        cache_path = self._embedding_cache_path(snapshot["paths"])
+        try:
+            np.savez(
+                cache_path,
+                model=np.array(EMBEDDING_MODEL),
+                stats_corpus=np.array(snapshot["stats_corpus"], dtype=str),
+                biz_corpus=np.array(snapshot["biz_corpus"], dtype=str),
+                stats_embeds=snapshot["stats_embeds"],
+                biz_embeds=snapshot["biz_embeds"]
             )
-            
-            print("✔️ 임베딩 생성 완료")
-            
         except Exception as e:
-            print(f"❌ 데이터 로드 오류: {e}")
-            # 폴백: 통계 데이터만 로드 + 안전한 임베딩 생성
+            print(f"⚠️ 임베딩 캐시 저장 실패 ({cache_path}): {e}")
+
+    def _build_snapshot(self, paths, previous=None):
+        """CSV를 읽어 새 스냅샷 생성. previous가 있으면 내용이 바뀐 행만 새로 임베딩"""
+        previous = previous or self._empty_snapshot(paths)
+        signature = self._data_signature(paths)
+
+        # 1. 통계 데이터 로드
+        df_stats = pd.read_csv(paths['startup_data'], encoding="utf-8")
+        stats_corpus = [self.text_processor.row_to_text(row) for _, row in df_stats.iterrows()]
+
+        # 2. 사업장 데이터 로드 (헤더 스킵) - 실패해도 통계 데이터만으로 계속 진행 (폴백)
+        try:
+            df_biz = pd.read_csv(paths['business_data'], encoding="utf-8", header=None)
+            biz_corpus = [self.text_processor.business_row_to_text(row) for idx, row in df_biz.iterrows() if idx > 0]
+        except Exception as e:
+            print(f"❌ 사업장 데이터 로드 오류: {e} (통계 데이터만 사용)")
+            biz_corpus = []
+
+        # 3. 분리 임베딩 생성 (변경 없는 행은 기존 임베딩 재사용)
+        print("통계 데이터 임베딩 생성 중...")
+        stats_embeds = self._embed_incremental(stats_corpus, previous["stats_corpus"], previous["stats_embeds"])
+        print("사업장 데이터 임베딩 생성 중...")
+        biz_embeds = self._embed_incremental(biz_corpus, previous["biz_corpus"], previous["biz_embeds"])
+
+        # 4. 업종 인덱스 (get_sector_statistics / get_sector_businesses 선형 탐색 대체)
+        sector_stats = {}
+        sector_biz = {}
+        for sector in self.text_processor.SYNONYMS.keys():
+            sector_stats[sector] = self._filter_sector_statistics(stats_corpus, sector)
+            sector_biz[sector] = [biz for biz in biz_corpus if "[사업장]" in biz and sector.lower() in biz.lower()]
+
+        return {
+            "stats_corpus": stats_corpus,
+            "biz_corpus": biz_corpus,
+            "stats_embeds": stats_embeds,
+            "biz_embeds": biz_embeds,
+            "sector_stats": sector_stats,
+            "sector_biz": sector_biz,
+            "sector_summary": self._build_sector_summary(df_stats),
+            "sector_table": self._build_sector_table(df_stats),
+            "paths": paths,
+            "signature": signature
+        }
+
+    SUMMARY_METRICS = {
+        '창업률(%)': '창업률',
+        '폐업률(%)': '폐업률',
+        '1년생존율(%)': '1년생존율',
+        '2년생존율(%)': '2년생존율',
+        '3년생존율(%)': '3년생존율'
+    }
+
+    def _build_sector_summary(self, df_stats):
+        """업종별 지표마다 최근값(연도, 전년비 증감)을 한 줄로 압축 (groupby 벡터 연산)"""
+        df = df_stats.copy()
+        df['연도'] = pd.to_numeric(df['연도'], errors='coerce')
+        df = df.sort_values(['업종구분', '연도'])
+
+        parts = {}
+        for col, label in self.SUMMARY_METRICS.items():
+            if col not in df.columns:
+                continue
+            values = pd.to_numeric(df[col], errors='coerce')
+            # 생존율은 최근 연도가 비어 있으므로 지표별로 값이 있는 행만 사용
+            valid = df.loc[values.notna() & df['연도'].notna(), ['업종구분', '연도']].assign(value=values)
+            valid = valid.drop_duplicates(['업종구분', '연도'], keep='last')
+            if valid.empty:
+                continue
+            grouped = valid.groupby('업종구분')
+            table = pd.DataFrame({
+                'latest': grouped['value'].last(),
+                'year': grouped['연도'].last()
+            })
+            # 전년비는 달력상 바로 앞 연도(year - 1) 값 기준 (그 해 값이 없으면 생략)
+            by_year = valid.set_index(['업종구분', '연도'])['value']
+            table['prev'] = by_year.reindex(list(zip(table.index, table['year'] - 1))).to_numpy()
+            table['delta'] = table['latest'] - table['prev']
+
+            for sector, row in table.iterrows():
+                delta = f", {row['delta']:+.1f}%p" if pd.notnull(row['delta']) else ""
+                parts.setdefault(sector, []).append(f"{label} {row['latest']:.1f}%({int(row['year'])}{delta})")
+
+        return {sector: " / ".join(items) for sector, items in parts.items()}
+
+    def _build_sector_table(self, df_stats):
+        """업종 → {연도: {지표: 값}}"""
+        table = {}
+        for record in df_stats.to_dict('records'):
+            year = pd.to_numeric(record.get('연도'), errors='coerce')
+            if pd.isnull(year):
+                continue
+            values = {col: record.get(col) for col in self.SUMMARY_METRICS}
+            table.setdefault(str(record['업종구분']), {})[int(year)] = values
+        return table
+
+    def _embed_incremental(self, corpus, prev_corpus, prev_embeds):
+        """이전 코퍼스와 문장 단위로 비교해서 추가/변경된 문장만 임베딩"""
+        if not corpus:
+            return np.array([])
+
+        known = {}
+        if len(prev_corpus) > 0 and len(prev_embeds) == len(prev_corpus):
+            known = {text: i for i, text in enumerate(prev_corpus)}
+        new_texts = [text for text in dict.fromkeys(corpus) if text not in known]
+
+        new_embeds = None
+        if new_texts:
+            new_embeds = self.embedder.encode(new_texts, convert_to_numpy=True, show_progress_bar=True)
+        new_index = {text: i for i, text in enumerate(new_texts)}
+        print(f"  - 전체 {len(corpus)}건 중 {len(new_texts)}건 신규 임베딩")
+
+        return np.vstack([
+            prev_embeds[known[text]] if text in known else new_embeds[new_index[text]]
+            for text in corpus
+        ])
+
+    def _data_signature(self, paths):
+        """데이터 파일별 (수정시각, 크기). 파일이 없으면 None"""
+        signature = {}
+        for key, path in paths.items():
             try:
-                df_stats = pd.read_csv(DATA_PATHS['startup_data'], encoding="utf-8")
-                self.stats_corpus = [self.text_processor.row_to_text(row) for _, row in df_stats.iterrows()]
-                self.biz_corpus = []
-                
-                # 🔥 중요: 폴백에서도 임베딩 생성
-                print("폴백: 통계 데이터 임베딩 생성 중...")
-                self.stats_embeds = self.embedder.encode(
-                    self.stats_corpus, 
-                    convert_to_numpy=True, 
-                    show_progress_bar=True
-                )
-                self.biz_embeds = np.array([])  # 빈 배열로 초기화
-                print("✔️ 폴백 임베딩 완료")
-                
-            except Exception as fallback_e:
-                print(f"❌ 폴백 로드도 실패: {fallback_e}")
-                # 최후의 수단: 빈 데이터로 초기화
-                self.stats_corpus = []
-                self.biz_corpus = []
-                self.stats_embeds = np.array([])
-                self.biz_embeds = np.array([])
+                stat = os.stat(path)
+                signature[key] = (stat.st_mtime_ns, stat.st_size)
+            except OSError:
+                signature[key] = None
+        return signature
+
+    def _start_watcher(self):
+        thread = threading.Thread(target=self._watch_data_files, name="startup-data-watcher", daemon=True)
+        thread.start()
+
+    def _watch_data_files(self):
+        """로드된 지역들의 데이터 파일을 주기적으로 확인해서 변경되면 백그라운드에서 재구축 후 스냅샷 교체"""
+        pending = {}
+        while True:
+            time.sleep(DATA_RELOAD_CONFIG['interval_sec'])
+            for region, snapshot in self.regions.items():
+                if snapshot["paths"] is None:
+                    continue
+                signature = self._data_signature(snapshot["paths"])
+                if signature == snapshot["signature"]:
+                    pending.pop(region, None)
+                    continue
+                # 파일 복사가 진행 중일 수 있으므로 두 번 연속 같은 상태일 때만 재구축
+                if signature != pending.get(region):
+                    pending[region] = signature
+                    continue
+                pending.pop(region, None)
+                self.reload_region(region)
+
+    def reload_region(self, region=None):
+        """지역 데이터 재구축 후 원자적 교체. 구축 중에도 요청은 이전 스냅샷으로 처리됨"""
+        region = region or self.default_region
+        with self._reload_lock:
+            current = self.regions.get(region)
+            if current is None:
+                return False
+            try:
+                print(f"🔄 [{region}] 데이터 파일 변경 감지, 재구축 중...")
+                snapshot = self._build_snapshot(current["paths"], previous=current)
+            except Exception as e:
+                print(f"❌ [{region}] 데이터 재구축 실패 (기존 데이터 유지): {e}")
+                return False
+            self._write_embedding_cache(snapshot)
+            self.regions.replace(region, snapshot)
+            print(f"✔️ [{region}] 데이터 교체 완료 (통계 {len(snapshot['stats_corpus'])}건, 사업장 {len(snapshot['biz_corpus'])}건)")
+            return True
 
     def detect_main_sector(self, question):
         """질문에서 가장 관련 높은 업종 1개만 추출"""
@@ -94,10 +342,17 @@ class StartupService:
         
         return "NULL"
 
-    def get_sector_statistics(self, sector):
+    def get_sector_statistics(self, sector, data=None):
         """특정 업종의 모든 통계 데이터 추출 및 정렬"""
+        data = data or self._data
+        if sector in data["sector_stats"]:
+            return data["sector_stats"][sector]
+        return self._filter_sector_statistics(data["stats_corpus"], sector)
+
+    @staticmethod
+    def _filter_sector_statistics(stats_corpus, sector):
         all_sector_stats = [
-            stat for stat in self.stats_corpus 
+            stat for stat in stats_corpus 
             if f"[통계]" in stat and sector.lower() in stat.lower()
         ]
         
@@ -110,13 +365,16 @@ class StartupService:
         return all_sector_stats_sorted
 
 
-    def get_sector_businesses(self, sector, user_keywords):
+    def get_sector_businesses(self, sector, user_keywords, data=None):
         """특정 업종의 사업장 데이터를 우선순위에 따라 선별"""
+        data = data or self._data
         # 해당 업종의 사업장 데이터
-        biz_examples = [
-            biz for biz in self.biz_corpus 
-            if f"[사업장]" in biz and sector.lower() in biz.lower()
-        ]
+        biz_examples = data["sector_biz"].get(sector)
+        if biz_examples is None:
+            biz_examples = [
+                biz for biz in data["biz_corpus"] 
+                if f"[사업장]" in biz and sector.lower() in biz.lower()
+            ]
         
         # 사용자 키워드가 포함된 사업장 우선 선택
         keyword_matches = []
@@ -177,10 +435,11 @@ class StartupService:
         
         return selected, len(biz_examples)
 
-    def analyze_question(self, question):
+    def analyze_question(self, question, main_sector=None, data=None):
         """질문 종합 분석 (코랩의 inspect_question 로직)"""
-        # 주 업종 감지
-        main_sector = self.detect_main_sector(question)
+        # 주 업종 감지 (후속 질문이면 이전 턴 업종을 넘겨받음)
+        if main_sector is None:
+            main_sector = self.detect_main_sector(question)
         
         # 키워드 정보
         sector_keywords = self.text_processor.SYNONYMS.get(main_sector, [])
@@ -193,13 +452,14 @@ class StartupService:
                 user_keywords.append(keyword)
         
         # 해당 업종 통계 데이터
-        statistics = self.get_sector_statistics(main_sector)
+        statistics = self.get_sector_statistics(main_sector, data)
         
         # 해당 업종 사업장 사례
-        business_examples, total_businesses = self.get_sector_businesses(main_sector, user_keywords)
+        business_examples, total_businesses = self.get_sector_businesses(main_sector, user_keywords, data)
         
         return {
             "sector": main_sector,
+            "summary": (data or self._data)["sector_summary"].get(main_sector),
             "keywords": sector_keywords,
             "user_keywords": user_keywords,
             "statistics": statistics,
@@ -207,13 +467,14 @@ class StartupService:
             "total_businesses": total_businesses
         }
 
-    def enhanced_search_context(self, question):
+    def enhanced_search_context(self, question, main_sector=None, data=None, basic_contexts=None):
         """업종 분석 기반 향상된 컨텍스트 검색"""
-        # 기본 임베딩 검색
-        basic_contexts = self.search_context(question, topk_stats=5, topk_biz=3)
+        # 기본 임베딩 검색 (배치 처리 시에는 미리 검색한 결과를 넘겨받음)
+        if basic_contexts is None:
+            basic_contexts = self.search_context(question, topk_stats=5, topk_biz=3, data=data)
         
         # 질문 분석
-        analysis = self.analyze_question(question)
+        analysis = self.analyze_question(question, main_sector, data)
         
         # 분석된 업종의 모든 통계 데이터 추가
         sector_stats = analysis["statistics"]
@@ -233,35 +494,175 @@ class StartupService:
         
         return all_contexts[:8]  # 최대 8개로 제한
 
-    def search_context(self, query, topk_stats=5, topk_biz=3):
+    def search_context(self, query, topk_stats=5, topk_biz=3, data=None):
         """통계 데이터와 사업장 데이터를 별도로 검색"""
-        q_emb = self.embedder.encode(query, convert_to_numpy=True)
-        
-        # 1. 통계 데이터 검색 (상위 5개)
-        stats_results = []
-        if len(self.stats_embeds) > 0:  # 🔥 안전 검사 추가
-            stats_sims = np.dot(self.stats_embeds, q_emb)
-            stats_ids = stats_sims.argsort()[-topk_stats:][::-1]
-            stats_results = [self.stats_corpus[i] for i in stats_ids]
-        
-        # 2. 사업장 데이터 검색 (데이터 존재시)
-        biz_results = []
-        if len(self.biz_embeds) > 0:  # 🔥 임베딩 존재 여부 확인
-            biz_sims = np.dot(self.biz_embeds, q_emb)
-            biz_ids = biz_sims.argsort()[-topk_biz:][::-1]
-            biz_results = [self.biz_corpus[i] for i in biz_ids]
-        
-        return stats_results + biz_results
+        return self.search_context_batch([query], topk_stats, topk_biz, data)[0]
+
+    def search_context_batch(self, queries, topk_stats=5, topk_biz=3, data=None):
+        """여러 질문을 한 번에 임베딩하고 데이터별 행렬곱 1회로 검색"""
+        data = data or self._data
+        q_embs = self.embedder.encode(queries, convert_to_numpy=True)
+        results = [[] for _ in queries]
+
+        # 1. 통계 데이터 검색 (상위 5개) → 2. 사업장 데이터 검색 (데이터 존재시)
+        targets = [
+            (data["stats_embeds"], data["stats_corpus"], topk_stats),
+            (data["biz_embeds"], data["biz_corpus"], topk_biz)
+        ]
+        for embeds, corpus, topk in targets:
+            if len(embeds) == 0:  # 🔥 임베딩 존재 여부 확인
+                continue
+            top_ids, _ = top_k(q_embs, embeds, topk)
+            for row, ids in enumerate(top_ids):
+                results[row].extend(corpus[i] for i in ids)
+
+        return results
+
+    def detect_lookup(self, question, session=None):
+        """단순 통계 조회 질문이면 {region, data, sector, metrics, year} 반환, 아니면 None (data: 판단에 쓴 지역 스냅샷)"""
+        parsed = parse_lookup(question)
+        if parsed is None:
+            return None
+        # 데이터가 없는 지역이 언급되면 (별칭 없이 "안동", "상주"만 써도) 기본 지역 통계로 답하지 않음
+        available = self.available_regions()
+        if any(region not in available for region in mentioned_regions(question)):
+            return None
+
+        region = self.detect_region(question, session)
+        data = self.regions.get(region)
+        sector = self.detect_main_sector(question)
+        if sector == "NULL" and session is not None:
+            sector = session.last_sector
+        if data is None or sector == "NULL" or sector not in data["sector_table"]:
+            return None
+        return {"region": region, "data": data, "sector": sector, **parsed}
+
+    def answer_lookup(self, question, session=None):
+        """통계 조회 질문이면 통계표/사업장 데이터로 바로 템플릿 답변 (LLM 호출 없음). 아니면 None"""
+        lookup = self.detect_lookup(question, session)
+        if lookup is None:
+            return None
+
+        # detect_lookup이 확인한 스냅샷 그대로 사용 (사이에 핫 리로드로 교체돼도 업종이 사라지지 않음)
+        region, data, sector = lookup["region"], lookup["data"], lookup["sector"]
+        rows = data["sector_table"][sector]
+        if lookup["year"] is not None and lookup["year"] not in rows:
+            years = sorted(rows)
+            return (f"{self.region_label(region)} {sector}의 {lookup['year']}년 통계 데이터는 없어요. "
+                    f"{years[0]}년부터 {years[-1]}년까지의 데이터를 조회할 수 있어요.")
+        years = [lookup["year"]] if lookup["year"] is not None else sorted(rows)
+        safe = lambda x: f"{x}%" if pd.notnull(x) and str(x).strip() != '' else '정보없음'
+
+        stats_lines = []
+        for year in years:
+            values = ", ".join(
+                f"{self.SUMMARY_METRICS[col]}={safe(rows[year].get(col))}" for col in lookup["metrics"]
+            )
+            stats_lines.append(f"- **{year}년**: {values}")
+
+        business_examples, _ = self.get_sector_businesses(sector, [], data)
+        biz_lines = [f"{i + 1}. {name} ({status})" for i, (name, status) in enumerate(business_examples[:3])] or ["데이터 없음"]
+
+        period = f"{years[0]}" if len(years) == 1 else f"{years[0]}-{years[-1]}"
+        output = f"✅ {self.region_label(region)} {sector} 통계 ({period})\n\n"
+        output += "📊 핵심 통계\n\n" + "\n".join(stats_lines) + "\n"
+        output += "\n🏢 현재 영업중인 대표사업장\n" + "\n".join(biz_lines) + "\n\n"
+        if session is not None:
+            output += f"💡 통계 해석과 창업 조언이 필요하시면 \"{self.ADVICE_FOLLOWUP}\"이라고 입력해 주세요."
+            session.note_lookup(question, sector, region)
+        else:
+            output += f"💡 통계 해석과 창업 조언이 필요하시면 \"{sector} 창업 조언해줘\"처럼 질문해 주세요."
+        return output
+
+    def advice_followup_question(self, question, session):
+        """'더 자세한 조언' 요청이면 직전 조회 질문을 반환 (LLM 조언 경로로 다시 처리)"""
+        if session is None or not session.pending_advice:
+            return None
+        if self.ADVICE_FOLLOWUP.replace(" ", "") not in question.replace(" ", ""):
+            return None
+        pending, session.pending_advice = session.pending_advice, None
+        return pending
+
+    def retrieve(self, question, session=None):
+        """LLM 호출 없는 검색 단계 (라벨링과 병렬로 미리 실행 가능)"""
+        # 질문의 지역 파티션만 검색. 요청 처리 중 핫 리로드가 일어나도 같은 스냅샷으로 끝까지 처리
+        region = self.detect_region(question, session)
+        data = self.regions.get(region)
+        if data is None:
+            return {"region": region, "contexts": [], "analysis": None}
+
+        # 0. 후속 질문("그럼 폐업률은?")에서 업종이 빠졌으면 직전 턴의 업종/질문을 이어받음
+        main_sector = self.detect_main_sector(question)
+        search_query = question
+        if session is not None and main_sector == "NULL" and session.last_sector != "NULL":
+            main_sector = session.last_sector
+            search_query = f"{session.last_question} {question}"
 
-# 전역 인스턴스
-    def llm_answer_with_rag(self, question, chat_history=None):
         # 1. 컨텍스트 검색
-        contexts = self.enhanced_search_context(question)
-        if not contexts:
-            return "안녕하세요! 대구 동성로 창업 지원 챗봇입니다. 관련 자료를 찾지 못했습니다."
+        contexts = self.enhanced_search_context(search_query, main_sector, data)
 
         # 2. 질문 분석
-        analysis = self.analyze_question(question)
+        analysis = self.analyze_question(question, main_sector, data)
+        return {"region": region, "contexts": contexts, "analysis": analysis}
+
+    def retrieve_batch(self, questions):
+        """배치용 검색: 지역별로 질문을 모아 임베딩/유사도 계산을 한 번에 처리 (세션 없음)"""
+        regions = [self.detect_region(q) for q in questions]
+        results = [None] * len(questions)
+        for region in dict.fromkeys(regions):
+            idx = [i for i, r in enumerate(regions) if r == region]
+            data = self.regions.get(region)
+            if data is None:
+                for i in idx:
+                    results[i] = {"region": region, "contexts": [], "analysis": None}
+                continue
+            basics = self.search_context_batch([questions[i] for i in idx], topk_stats=5, topk_biz=3, data=data)
+            for i, basic in zip(idx, basics):
+                sector = self.detect_main_sector(questions[i])
+                results[i] = {
+                    "region": region,
+                    "contexts": self.enhanced_search_context(questions[i], sector, data, basic),
+                    "analysis": self.analyze_question(questions[i], sector, data)
+                }
+        return results
+
+    def llm_answer_with_rag(self, question, session=None, retrieved=None):
+        if retrieved is None:
+            retrieved = self.retrieve(question, session)
+        composed = self.compose_answer(question, retrieved)
+        if composed["reply"] is not None:
+            return composed["reply"]
+
+        generated = True
+        try:
+            llm_advice = self._generate_with_history(composed, session)
+        except GenerationRejected as e:
+            if not composed["header"]:
+                raise
+            # 마감 내 생성 불가: 통계/사업장 정형 출력만 반환 (LLM 조언 생략)
+            print(f"⚠️ 조언 생성 생략: {e}")
+            generated = False
+            llm_advice = "💡 현재 요청이 많아 상세 조언은 생략했어요. 잠시 후 다시 질문해 주세요."
+
+        # 6. 최종 정형화 출력 합치기
+        output = composed["header"] + llm_advice
+
+        if session is not None and generated:
+            session.add_turn(question, composed["prompt"], llm_advice, composed["sector"], composed["region"])
+
+        return output
+
+    def compose_answer(self, question, retrieved):
+        """검색 결과로 정형 출력(header)과 LLM 프롬프트 구성. LLM 없이 끝나는 경우 reply에 최종 답변"""
+        contexts = retrieved["contexts"]
+        analysis = retrieved["analysis"]
+        region = retrieved.get("region", self.default_region)
+        label = self.region_label(region)
+        if analysis is None:
+            supported = ", ".join(self.available_regions())
+            return {"reply": f"아직 {label} 지역 데이터는 준비 중이에요. 현재 지원 지역: {supported}"}
+        if not contexts:
+            return {"reply": f"안녕하세요! {label} 창업 지원 챗봇입니다. 관련 자료를 찾지 못했습니다."}
 
         # 3. 핵심 통계 부분 직접 포맷팅 (연도 오름차순 정렬 포함)
         stats_with_year = []
@@ -288,20 +689,20 @@ class StartupService:
             biz_lines.append("데이터 없음")
 
         output = ""
+        baseline_prompt = None
 
         if (len(stats_lines) != 0):
             # 5. LLM에 보낼 간단 요약 문자열 생성
             stats_summary = " / ".join([line.split(": ",1)[1] for line in stats_lines]) or "통계 데이터가 부족합니다."
-
-            prompt = (
+            stats_prompt = lambda stats_block, coverage_rule: (
                 "현재 시점: 2025년 8월\n"
-                "당신은 대구 동성로 창업 전문가입니다.\n"
-                f"다음은 최근 6년간 주요 통계 수치입니다:\n{stats_summary}\n"
+                f"당신은 {label} 창업 전문가입니다.\n"
+                f"{stats_block}\n"
                 "[핵심 원칙]\n"
                 "✅ 데이터 수치 정확히 제시\n"
-                "서울등, 동성로외 지역은 답변하지 않음\n"
+                f"서울등, {label} 외 지역은 답변하지 않음\n"
                 "❌ 데이터에 없는 정보 추측 및 임의 생성 금지, 찾을수없는 데이터는 데이터가 없다고 솔직하게 말할것\n\n"
-                "통계 데이터는 2020년 부터 2025년까지 모두 반영되어야 합니다.\n\n"
+                f"{coverage_rule}\n\n"
                 "아래 1번 2번,정보 출력 금지\n"
 
                 "1. 🔍통계 해석: 핵심 통계를 기반해 인사이트 도출 및 시사점 제시\n"
@@ -310,12 +711,20 @@ class StartupService:
                 f"질문: {question}\n"
                 "답변:"
             )
-            messages = [
-                {"role": "system", "content": "창업 통계 전문가. 데이터를 기반으로 정확하고 간결한 조언 제공."},
-                {"role": "user", "content": prompt}
-            ]
-            llm_advice = self.llm.generate_response(messages, max_new_tokens=512, do_sample=False)
-            output += f"✅ 동성로 {analysis.get('sector', '업종명')} 창업 통계 분석 (2020-2025)\n\n"
+            # 연도별 원본 수치 대신 미리 계산한 압축 요약 사용 (절약 토큰 계산용으로 원본 프롬프트도 보관)
+            baseline_prompt = stats_prompt(
+                f"다음은 최근 6년간 주요 통계 수치입니다:\n{stats_summary}",
+                "통계 데이터는 2020년 부터 2025년까지 모두 반영되어야 합니다."
+            )
+            if analysis.get('summary'):
+                prompt = stats_prompt(
+                    f"지표별 최근값(연도, 전년비): {analysis['summary']}",
+                    "지표별 연도는 요약 그대로 사용."
+                )
+            else:
+                prompt = baseline_prompt
+            system_content = "창업 통계 전문가. 데이터를 기반으로 정확하고 간결한 조언 제공."
+            output += f"✅ {label} {analysis.get('sector', '업종명')} 창업 통계 분석 (2020-2025)\n\n"
             output += "📊 핵심 통계\n\n" + "\n".join(f"- {line}" for line in stats_lines) + ("\n" if stats_lines else "\n- 데이터 없음\n")
             output += "\n🏢 현재 영업중인 대표사업장\n"
             output += "\n".join(biz_lines) + "\n\n"
@@ -324,12 +733,12 @@ class StartupService:
             # 통계가 없을 때:
             prompt = (
                 "현재 시점: 2025년 8월\n"
-                "당신은 대구 동성로 지역에서 활동하는 창업 전문가입니다.\n"
+                f"당신은 {label} 지역에서 활동하는 창업 전문가입니다.\n"
                 "창업과 관련된 폭넓은 지식을 바탕으로 질문에 답변합니다.\n"
                 "질문 내용이 창업과 직간접적으로 관련되지 않아도 최대한 도움될 만한 정보를 제공합니다.\n"
                 "\n[중요 안내사항]\n"
                 "- 수치나 통계 정보가 없을 경우에는 절대로 추측하거나 임의의 숫자를 생성하지 마십시오.\n"
-                "- 동성로 지역 및 창업 분야에 한정된 내용으로 답변을 제한하십시오.\n"
+                f"- {label} 지역 및 창업 분야에 한정된 내용으로 답변을 제한하십시오.\n"
                 "- 질문이 창업과 무관하거나 데이터가 부족할 경우, 창업 관련 일반적 팁이나 절차적 조언을 중심으로 답하십시오.\n"
                 "\n[답변 형식]\n"
                 "1. 창업 실전에서 유용한 조언을 세 가지 구체적인 팁 형태로 제시하십시오.\n"
@@ -339,15 +748,43 @@ class StartupService:
                 f"질문: {question}\n"
                 "답변:"
             )
-            messages = [
-                {"role": "system", "content": "창업 전문가. 창업자에게 실질적 도움과 현실적인 조언을 제공하는 역할."},
-                {"role": "user", "content": prompt}
-            ]
-            llm_advice = self.llm.generate_response(messages, max_new_tokens=512, do_sample=False)
+            system_content = "창업 전문가. 창업자에게 실질적 도움과 현실적인 조언을 제공하는 역할."
 
-        # 6. 최종 정형화 출력 합치기
-        output += llm_advice
+        return {
+            "reply": None,
+            "header": output,
+            "system": system_content,
+            "prompt": prompt,
+            "baseline_prompt": baseline_prompt,
+            "sector": analysis.get('sector', "NULL"),
+            "region": region
+        }
 
-        return output
+    def _generate_with_history(self, composed, session):
+        """세션이 있으면 이전 대화를 앞에 붙이고, 이전 턴의 KV 캐시를 재사용해 새 토큰만 prefill"""
+        messages = self.build_messages(composed, session)
+        kv_state = session.kv_state if session is not None else None
+        return self.llm.generate_response(messages, max_new_tokens=512, do_sample=False, kv_state=kv_state)
+
+    def build_messages(self, composed, session=None):
+        """system + 이전 대화 + 이번 프롬프트. 토큰 예산을 넘으면 오래된 대화부터 제외"""
+        history = session.recent_history(SESSION_CONFIG['max_history_turns']) if session is not None else []
+        turns = [history[i:i + 2] for i in range(0, len(history), 2)]
+
+        def build(kept_turns, prompt=composed["prompt"]):
+            messages = [{"role": "system", "content": composed["system"]}]
+            for turn in kept_turns:
+                messages += turn
+            messages.append({"role": "user", "content": prompt})
+            return messages
+
+        baseline_tokens = None
+        if composed.get("baseline_prompt") and composed["baseline_prompt"] != composed["prompt"]:
+            baseline_tokens = prompt_budget.count(self.llm, build(turns, composed["baseline_prompt"]))
+        messages, _ = prompt_budget.fit(
+            self.llm, "startup", build, turns,
+            drop_from_start=True, min_items=0, baseline_tokens=baseline_tokens
+        )
+        return messages
 
 startup_service = StartupService()
\ No newline at end of file
@@ -3,13 +3,18 @@ import json
 import numpy as np
 from datetime import datetime, timedelta
 from models.embedding_model import embedding_instance
-from models.llm_model import llm_instance
+from models.model_registry import model_registry
+from utils.prompt_budget import prompt_budget
 from config.settings import NAVER_DATALAB_CONFIG
+from config.constants import CATEGORY_TREND, TASK_EXTRACTION
+
+NO_TREND_REPLY = "트렌드 데이터를 찾을 수 없어 정확한 분석이 어렵습니다. 다른 키워드로 다시 질문해 주세요!"
 
 class TrendService:
     def __init__(self):
         self.embedder = embedding_instance
-        self.llm = llm_instance
+        self.llm = model_registry.task(CATEGORY_TREND)
+        self.extractor = model_registry.task(TASK_EXTRACTION)  # 키워드 추출은 가벼운 모델로 라우팅 가능
         
         # 네이버 데이터랩 API 설정
         self.client_id = NAVER_DATALAB_CONFIG.get('client_id', '')
@@ -18,12 +23,17 @@ class TrendService:
 
     def _extract_keywords(self, question):
         """질문에서 키워드 1개 추출"""
+        response = self.extractor.generate_response(self._extraction_messages(question), max_new_tokens=50, do_sample=False)
+        return self._parse_keywords(response)
+
+    def _extraction_messages(self, question):
         extract_prompt = f"다음 질문에서 트렌드 분석할 대표적인 키워드 하나만 추출해줘: {question}"
-        messages = [
+        return [
             {"role": "system", "content": "키워드만 간단히 추출해줘."},
             {"role": "user", "content": extract_prompt}
         ]
-        response = self.llm.generate_response(messages, max_new_tokens=50, do_sample=False)
+
+    def _parse_keywords(self, response):
         # 쉼표로 분리하지 않고 첫 번째 키워드만 사용
         keyword = response.split(',')[0].strip() if ',' in response else response.strip()
         return [keyword]  # 리스트에 하나만 담아 반환
@@ -47,7 +57,7 @@ class TrendService:
             "keywordGroups": keyword_groups
         }
         
-        response = requests.post(self.api_url, headers=headers, data=json.dumps(body))
+        response = requests.post(self.api_url, headers=headers, data=json.dumps(body), timeout=10)
         return response.json()
 
     def _convert_to_text(self, keywords, trend_data):
@@ -62,20 +72,53 @@ class TrendService:
             texts.append(f"{keyword} 검색량: {', '.join(data_str)}")
         return texts
 
-    def llm_answer_with_trend(self, question):
-        """네이버 데이터랩 트렌드 데이터 기반 창업 답변 생성 (간결 버전)"""
-        
-        # 키워드 추출 및 트렌드 데이터 조회
+    def fetch_trend_context(self, question):
+        """키워드 추출 + 데이터랩 조회"""
         keywords = self._extract_keywords(question)
         trend_data = self._fetch_trend_data(keywords)
-        trend_texts = self._convert_to_text(keywords, trend_data)
-        
         # 키워드가 1개이므로 trend_texts도 1개 -> 유사도 계산 불필요
-        contexts = trend_texts
+        return self._convert_to_text(keywords, trend_data)
+
+    def fetch_trend_context_batch(self, questions):
+        """배치용: 키워드 추출은 한 번의 배치 생성으로, 데이터랩 조회는 질문별로"""
+        responses = self.extractor.generate_batch(
+            [self._extraction_messages(q) for q in questions], max_new_tokens=50, do_sample=False
+        )
+        results = []
+        for response in responses:
+            keywords = self._parse_keywords(response)
+            try:
+                results.append(self._convert_to_text(keywords, self._fetch_trend_data(keywords)))
+            except Exception as e:
+                print(f"데이터랩 조회 실패 ({keywords[0]}): {e}")
+                results.append([])
+        return results
+
+    def llm_answer_with_trend(self, question, contexts=None):
+        """네이버 데이터랩 트렌드 데이터 기반 창업 답변 생성 (간결 버전)"""
+        
+        # 키워드 추출 및 트렌드 데이터 조회
+        if contexts is None:
+            contexts = self.fetch_trend_context(question)
         
         if not contexts:
-            return "트렌드 데이터를 찾을 수 없어 정확한 분석이 어렵습니다. 다른 키워드로 다시 질문해 주세요!"
+            return NO_TREND_REPLY
+
+        messages = self.fit_messages(question, contexts)
+        response = self.llm.generate_response(
+            messages, 
+            max_new_tokens=500,
+            do_sample=False,
+        )
         
+        return response
+
+    def fit_messages(self, question, contexts):
+        """토큰 예산을 넘으면 유사도 낮은 컨텍스트부터 제외"""
+        messages, _ = prompt_budget.fit(self.llm, "trend", lambda kept: self.build_messages(question, kept), contexts)
+        return messages
+
+    def build_messages(self, question, contexts):
         # 간결한 프롬프트
         prompt = (
             f"현재: 2025년 8월, 대구 동성로 창업 트렌드 전문가\n\n"
@@ -121,14 +164,7 @@ class TrendService:
             },
             {"role": "user", "content": prompt}
         ]
-        
-        response = self.llm.generate_response(
-            messages, 
-            max_new_tokens=500,
-            do_sample=False,
-        )
-        
-        return response
+        return messages
 
 # 전역 인스턴스
 trend_service = TrendService()
\ No newline at end of file
@@ -0,0 +1,11 @@
+import os
+import sys
+
+# 서버와 같은 방식으로 backend 폴더 기준 import (from config..., from services...)
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+# 테스트에서는 서버 시작용 모델 미리 로드를 하지 않음 (config.settings import 전에 설정)
+os.environ["MODEL_PRELOAD_TASKS"] = ""
+# 기본 지역 데이터 로드(임베딩)와 데이터 파일 감시 스레드도 시작하지 않음 (테스트가 필요할 때 직접 로드)
+os.environ["REGION_PRELOAD_DEFAULT"] = "false"
+os.environ["DATA_RELOAD_ENABLED"] = "false"
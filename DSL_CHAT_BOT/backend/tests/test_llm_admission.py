@@ -0,0 +1,51 @@
+import threading
+import pytest
+from models.llm_model import LLMModel
+from utils.request_context import RequestContext, GenerationRejected
+
+def _llm(prefill_sec=0.001, decode_sec=0.05):
+    """체크포인트 로드 없이 수용 제어 상태만 가진 LLMModel"""
+    llm = LLMModel.__new__(LLMModel)
+    llm._stats_lock = threading.Lock()
+    llm._queued = 0
+    llm._pending_sec = 0.0
+    llm._prefill_sec = prefill_sec
+    llm._decode_sec = decode_sec
+    return llm
+
+def test_estimate_depends_on_job_length():
+    llm = _llm()
+    labeling = llm.estimate_sec(200, 4)
+    answer = llm.estimate_sec(200, 512)
+    assert labeling == pytest.approx(200 * 0.001 + 4 * 0.05)
+    assert answer == pytest.approx(200 * 0.001 + 512 * 0.05)
+
+def test_wait_is_sum_of_pending_estimates():
+    llm = _llm()
+    first, second = llm.estimate_sec(200, 4), llm.estimate_sec(1000, 512)
+    llm._enqueue(first)
+    llm._enqueue(second)
+    assert llm.estimated_wait_sec() == pytest.approx(first + second)
+
+    llm._dequeue(second)
+    assert llm.estimated_wait_sec() == pytest.approx(first)
+    llm._dequeue(first)
+    assert llm.estimated_wait_sec() == 0.0
+    assert llm._queued == 0
+
+def test_short_jobs_ahead_do_not_reject():
+    llm = _llm()
+    for _ in range(5):
+        llm._enqueue(llm.estimate_sec(200, 4))  # 라벨링 5건 ≈ 2초
+    llm._check_queue(RequestContext(9), 500, 512)
+
+def test_long_jobs_ahead_reject():
+    llm = _llm()
+    llm._enqueue(llm.estimate_sec(1000, 512))  # 답변 1건 ≈ 26.6초
+    with pytest.raises(GenerationRejected):
+        llm._check_queue(RequestContext(9), 500, 512)
+
+def test_no_measurements_accepts():
+    llm = _llm(prefill_sec=None, decode_sec=None)
+    llm._enqueue(100.0)
+    llm._check_queue(RequestContext(1), 500, 512)
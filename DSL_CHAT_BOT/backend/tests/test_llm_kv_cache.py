@@ -0,0 +1,74 @@
+import torch
+from transformers import DynamicCache, LlamaConfig, LlamaForCausalLM
+from models.llm_model import LLMModel
+
+def _tiny_llm():
+    """체크포인트 없이 작은 랜덤 Llama로 캐시 관련 메서드만 사용"""
+    torch.manual_seed(0)
+    config = LlamaConfig(
+        vocab_size=64, hidden_size=16, intermediate_size=32,
+        num_hidden_layers=2, num_attention_heads=2, num_key_value_heads=2
+    )
+    llm = LLMModel.__new__(LLMModel)
+    llm.model_name = "tiny"
+    llm.llm = LlamaForCausalLM(config).eval()
+    return llm
+
+def _empty_state():
+    return {"past_key_values": None, "token_ids": None, "nbytes": 0, "model": None}
+
+def _generate(llm, input_ids, kv_state):
+    """generate_response와 같은 순서: 캐시 준비 → generate → 캐시 저장. prefill한 토큰 수 반환"""
+    cache = llm._prepare_cache(kv_state, input_ids)
+    prefill = input_ids.shape[-1] - cache.get_seq_length()
+    output = llm.llm.generate(
+        input_ids, attention_mask=torch.ones_like(input_ids),
+        max_new_tokens=4, do_sample=False, pad_token_id=0,
+        past_key_values=cache, return_dict_in_generate=True
+    )
+    llm._save_cache(kv_state, output.sequences, output.past_key_values)
+    return output.sequences, prefill
+
+def test_first_turn_keeps_reusable_cache():
+    llm = _tiny_llm()
+    kv_state = _empty_state()
+    sequences, _ = _generate(llm, torch.tensor([[1, 5, 6, 7, 8, 9]]), kv_state)
+
+    assert isinstance(kv_state["past_key_values"], DynamicCache)
+    assert kv_state["nbytes"] > 0
+    assert kv_state["model"] == "tiny"
+    # 마지막 생성 토큰은 forward 되지 않으므로 캐시는 1토큰 짧음
+    assert kv_state["token_ids"].shape[-1] == sequences.shape[-1] - 1
+
+def test_second_turn_prefills_fewer_tokens():
+    llm = _tiny_llm()
+    kv_state = _empty_state()
+    turn1 = torch.tensor([[1, 5, 6, 7, 8, 9]])
+    sequences, prefill1 = _generate(llm, turn1, kv_state)
+
+    # 다음 턴 입력 = 이전 입력 + 응답 + 새 질문
+    turn2 = torch.cat([sequences, torch.tensor([[3, 10, 11, 12]])], dim=-1)
+    _, prefill2 = _generate(llm, turn2, kv_state)
+
+    assert prefill1 == turn1.shape[-1]
+    assert prefill2 == turn2.shape[-1] - (sequences.shape[-1] - 1)
+    assert prefill2 < turn2.shape[-1]
+
+def test_diverging_prefix_crops_cache():
+    llm = _tiny_llm()
+    kv_state = _empty_state()
+    _generate(llm, torch.tensor([[1, 5, 6, 7, 8, 9]]), kv_state)
+
+    # 오래된 대화가 잘려 3번째 토큰부터 달라진 입력
+    cache = llm._reusable_cache(kv_state, torch.tensor([[1, 5, 20, 21, 22]]))
+    assert cache.get_seq_length() == 2
+
+def test_cache_from_other_model_is_not_reused():
+    llm = _tiny_llm()
+    kv_state = _empty_state()
+    _generate(llm, torch.tensor([[1, 5, 6, 7, 8, 9]]), kv_state)
+    kv_state["model"] = "other"
+
+    cache = llm._prepare_cache(kv_state, torch.tensor([[1, 5, 6, 7, 8, 9, 10]]))
+    assert isinstance(cache, DynamicCache)
+    assert cache.get_seq_length() == 0
@@ -0,0 +1,53 @@
+import pytest
+from utils.lookup_parser import parse_lookup, names_multiple_sectors
+from utils.region_matcher import mentioned_regions
+
+def test_metric_lookup():
+    assert parse_lookup("카페 폐업률 알려줘") == {"metrics": ["폐업률(%)"], "year": None}
+
+def test_year_and_specific_survival_rate():
+    assert parse_lookup("2023년 치킨 3년 생존율") == {"metrics": ["3년생존율(%)"], "year": 2023}
+
+def test_generic_survival_rate_returns_all_periods():
+    assert parse_lookup("치킨 생존률")["metrics"] == ["1년생존율(%)", "2년생존율(%)", "3년생존율(%)"]
+
+def test_year_outside_data_is_kept_for_caller():
+    # 데이터에 없는 연도인지는 answer_lookup에서 판단 (전체 연도로 대체하지 않음)
+    assert parse_lookup("2019년 치킨 폐업률")["year"] == 2019
+
+@pytest.mark.parametrize("question", [
+    "카페 폐업률 높은데 창업 어때?",   # 조언 요청
+    "서울 카페 폐업률",               # 다른 시·도
+    "카페 창업 전망",                 # 조회 지표 없음
+    "카페 폐업률이랑 치킨 폐업률 비교해줘",
+    "카페 폐업률이랑 치킨 폐업률",     # 업종 2개
+    "편의점 창업률 순위",
+    "폐업률 높은 업종",
+    "생존율 낮은 업종 알려줘",
+    "치킨 창업률 차이",
+])
+def test_not_a_plain_lookup(question):
+    assert parse_lookup(question) is None
+
+@pytest.mark.parametrize("question, region", [
+    ("안동 카페 폐업률", "안동"),
+    ("상주 치킨 생존율", "상주"),
+    ("포항 분식 창업률", "포항"),
+])
+def test_region_without_suffix_is_mentioned(question, region):
+    assert region in mentioned_regions(question)
+
+def test_no_region_mentioned():
+    assert mentioned_regions("카페 폐업률 알려줘") == set()
+
+@pytest.mark.parametrize("question", [
+    "카페 폐업률 알려줘",      # 카페/제과제빵, 보드게임카페에 모두 걸치는 키워드 1개
+    "브런치 카페 창업률",      # 두 키워드 모두 카페/제과제빵
+    "애견카페 폐업률",         # 애견카페에 포함된 '카페'는 따로 세지 않음
+    "고기집 폐업률",
+])
+def test_single_sector(question):
+    assert not names_multiple_sectors(question)
+
+def test_two_sectors():
+    assert names_multiple_sectors("카페랑 치킨 폐업률")
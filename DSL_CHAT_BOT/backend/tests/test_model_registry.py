@@ -0,0 +1,61 @@
+import torch
+from safetensors.torch import save_file
+import models.model_registry as model_registry_module
+from models.llm_model import load_dtype
+from models.model_registry import ModelRegistry
+
+MB = 1024 * 1024
+SIZES = {"big": 200 * MB, "small": 100 * MB}
+
+class FakeModel:
+    """로드되는 순간 레지스트리에 이미 올라가 있던 모델을 기록"""
+    loaded_alongside = {}
+
+    def __init__(self, model_name, tokenizer=None):
+        self.model_name = model_name
+        FakeModel.loaded_alongside[model_name] = list(FakeModel.registry._models)
+
+    def memory_nbytes(self):
+        return SIZES[self.model_name]
+
+    def generate_response(self, messages, **kwargs):
+        return self.model_name
+
+def _registry(monkeypatch, max_mb):
+    registry = ModelRegistry()
+    registry.max_bytes = max_mb * MB
+    registry.routes = {"labeling": "small", "startup": "big"}
+    registry._stats = {task: {"calls": 0, "items": 0, "total_sec": 0.0, "last_sec": None} for task in registry.routes}
+    FakeModel.registry = registry
+    FakeModel.loaded_alongside = {}
+    monkeypatch.setattr(model_registry_module, "LLMModel", FakeModel)
+    monkeypatch.setattr(registry, "tokenizer", lambda model_name: None)
+    monkeypatch.setattr(registry, "estimate_nbytes", lambda model_name: SIZES[model_name])
+    return registry
+
+def test_evicts_before_loading_new_model(monkeypatch):
+    registry = _registry(monkeypatch, max_mb=250)
+    registry.task("startup").generate_response([])
+    registry.task("labeling").generate_response([])
+
+    # big(200MB)은 small(100MB)을 로드하기 전에 내려가야 함 (로드 순간 300MB 방지)
+    assert FakeModel.loaded_alongside["small"] == []
+    assert registry.report()["loaded_models"] == ["small"]
+
+def test_tasks_on_same_model_share_weights(monkeypatch):
+    registry = _registry(monkeypatch, max_mb=1000)
+    registry.routes["extraction"] = "small"
+    registry._stats["extraction"] = {"calls": 0, "items": 0, "total_sec": 0.0, "last_sec": None}
+    registry.task("labeling").generate_response([])
+    registry.task("extraction").generate_response([])
+
+    assert registry.model("small") is registry.model("small")
+    report = registry.report()
+    assert report["loaded_models"] == ["small"]
+    assert report["tasks"]["labeling"]["calls"] == 1
+    assert report["tasks"]["extraction"]["calls"] == 1
+
+def test_estimate_from_local_safetensors(tmp_path):
+    save_file({"a": torch.zeros(10, 20), "b": torch.zeros(5)}, str(tmp_path / "model.safetensors"))
+    dtype_bytes = torch.finfo(load_dtype()).bits // 8
+    assert ModelRegistry.estimate_nbytes(str(tmp_path)) == 205 * dtype_bytes
@@ -0,0 +1,47 @@
+from utils.prompt_budget import PromptBudget
+
+class WordTokenizer:
+    """메시지 내용을 띄어쓰기 단위로 세는 토크나이저 (채팅 템플릿 토큰은 메시지당 1개)"""
+    def apply_chat_template(self, messages, tokenize=True, add_generation_prompt=True):
+        return [0] * sum(1 + len(m["content"].split()) for m in messages)
+
+class FakeLLM:
+    tokenizer = WordTokenizer()
+
+def _budget(limit):
+    budget = PromptBudget()
+    budget.budgets = {"test": limit}
+    return budget
+
+def _build(items):
+    return [{"role": "user", "content": " ".join(items)}]
+
+def test_within_budget_keeps_everything():
+    messages, report = _budget(100).fit(FakeLLM(), "test", _build, ["a", "b", "c"])
+    assert messages == _build(["a", "b", "c"])
+    assert report["prompt_tokens"] == 4
+    assert report["saved_tokens"] == 0
+
+def test_drops_from_end_until_within_budget():
+    messages, report = _budget(3).fit(FakeLLM(), "test", _build, ["a", "b", "c", "d"])
+    assert messages == _build(["a", "b"])
+    assert report["prompt_tokens"] == 3
+    assert report["saved_tokens"] == 2
+
+def test_drops_oldest_first_when_requested():
+    messages, _ = _budget(3).fit(FakeLLM(), "test", _build, ["a", "b", "c", "d"], drop_from_start=True)
+    assert messages == _build(["c", "d"])
+
+def test_keeps_min_items_even_over_budget():
+    messages, report = _budget(1).fit(FakeLLM(), "test", _build, ["a", "b"], min_items=1)
+    assert messages == _build(["a"])
+    assert report["prompt_tokens"] > report["budget"]
+
+def test_saved_tokens_measured_against_baseline():
+    _, report = _budget(100).fit(FakeLLM(), "test", _build, ["a"], baseline_tokens=10)
+    assert report["saved_tokens"] == 8
+
+def test_unknown_category_is_not_limited():
+    messages, report = _budget(1).fit(FakeLLM(), "other", _build, ["a", "b", "c"])
+    assert messages == _build(["a", "b", "c"])
+    assert report["budget"] is None
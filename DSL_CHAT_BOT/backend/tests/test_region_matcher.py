@@ -0,0 +1,31 @@
+import pytest
+from utils.region_matcher import match_region
+
+@pytest.mark.parametrize("question, region", [
+    ("동성로 카페 폐업률 알려줘", "동성로"),
+    ("대구 중구 치킨집 창업", "동성로"),
+    ("대구중구 치킨집 창업", "동성로"),
+    ("달서구 미용실 생존율", "달서구"),  # '서구'보다 긴 별칭 우선
+    ("대구 서구 분식 창업", "서구"),
+    ("수성못 근처 카페", "수성구"),
+    ("포항에서 횟집 창업하면?", "포항"),
+    ("안동시 찜닭집 전망", "안동"),
+])
+def test_region_mentions(question, region):
+    assert match_region(question) == region
+
+@pytest.mark.parametrize("question", [
+    "화원 창업 전망 어때?",          # 꽃집
+    "경주마 관련 사업 어때?",
+    "요즘 구미가 당기는 메뉴 창업",
+    "다사다난한 요식업 창업",
+    "성서 공부 카페 창업",
+    "강남구 카페 창업",
+    "서울 강서구 치킨집",
+    "부산 중구 횟집",
+    "안동찜닭 프랜차이즈 창업",
+    "고령자 대상 창업",
+    "치킨 폐업률 알려줘",
+])
+def test_common_words_and_other_cities_are_not_regions(question):
+    assert match_region(question) is None
@@ -0,0 +1,61 @@
+import numpy as np
+from services.region_store import RegionStore
+
+def _snapshot(rows=10, dim=4):
+    return {
+        "stats_corpus": [], "biz_corpus": [],
+        "stats_embeds": np.zeros((0, dim), dtype=np.float32),
+        "biz_embeds": np.zeros((rows, dim), dtype=np.float32)
+    }
+
+PARTITION_BYTES = RegionStore.partition_nbytes(_snapshot())
+
+class CountingLoader:
+    def __init__(self, missing=()):
+        self.calls = []
+        self.missing = set(missing)
+
+    def __call__(self, region):
+        self.calls.append(region)
+        return None if region in self.missing else _snapshot()
+
+def test_partition_is_loaded_once():
+    loader = CountingLoader()
+    store = RegionStore(loader, max_bytes=10 * PARTITION_BYTES)
+    assert store.get("a") is store.get("a")
+    assert loader.calls == ["a"]
+
+def test_missing_region_is_not_cached():
+    loader = CountingLoader(missing=["x"])
+    store = RegionStore(loader, max_bytes=10 * PARTITION_BYTES)
+    assert store.get("x") is None
+    assert store.get("x") is None
+    assert loader.calls == ["x", "x"]
+    assert store.total_bytes() == 0
+
+def test_least_recently_used_partition_is_evicted():
+    loader = CountingLoader()
+    store = RegionStore(loader, max_bytes=2 * PARTITION_BYTES)
+    store.get("a")
+    store.get("b")
+    store.get("a")
+    store.get("c")  # b가 가장 오래 안 쓴 파티션
+    assert [region for region, _ in store.items()] == ["a", "c"]
+    assert store.total_bytes() == 2 * PARTITION_BYTES
+
+def test_pinned_partition_is_never_evicted():
+    loader = CountingLoader()
+    store = RegionStore(loader, max_bytes=PARTITION_BYTES, pinned=["home"])
+    store.get("home")
+    store.get("a")
+    store.get("b")
+    assert [region for region, _ in store.items()] == ["home", "b"]
+
+def test_replace_only_updates_loaded_partitions():
+    store = RegionStore(CountingLoader(), max_bytes=10 * PARTITION_BYTES)
+    store.get("a")
+    fresh = _snapshot()
+    store.replace("a", fresh)
+    store.replace("b", _snapshot())
+    assert store.get("a") is fresh
+    assert [region for region, _ in store.items()] == ["a"]
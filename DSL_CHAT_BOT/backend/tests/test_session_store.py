@@ -0,0 +1,98 @@
+import threading
+import pytest
+from services.session_store import SessionStore
+from utils.request_context import GenerationRejected
+
+def _store(max_sessions=10, max_history_turns=3, max_kv_bytes=1000):
+    store = SessionStore()
+    store.max_sessions = max_sessions
+    store.max_history_turns = max_history_turns
+    store.max_kv_bytes = max_kv_bytes
+    return store
+
+def _fill_cache(session, nbytes):
+    session.kv_state.update({"past_key_values": object(), "token_ids": object(), "nbytes": nbytes, "model": "m"})
+
+def test_without_session_id_returns_none():
+    store = _store()
+    assert store.get(None) is None
+    assert store.get("") is None
+
+def test_same_id_returns_same_session():
+    store = _store()
+    assert store.get("a") is store.get("a")
+
+def test_least_recently_used_session_is_evicted():
+    store = _store(max_sessions=2)
+    first = store.get("a")
+    store.get("b")
+    store.get("a")
+    store.get("c")  # b가 가장 오래 안 쓴 세션
+    assert "b" not in store._sessions
+    assert store.get("a") is first
+
+def test_idle_session_is_evicted():
+    store = _store()
+    session = store.get("a")
+    session.last_access -= store.idle_timeout + 1
+    assert store.get("a") is not session
+
+def test_commit_trims_history():
+    store = _store(max_history_turns=2)
+    session = store.get("a")
+    for i in range(4):
+        session.add_turn(f"q{i}", f"u{i}", f"a{i}")
+    store.commit(session)
+
+    assert [m["content"] for m in session.history] == ["u2", "a2", "u3", "a3"]
+    assert session.last_question == "q3"
+
+def test_commit_frees_oldest_kv_cache_first():
+    store = _store(max_kv_bytes=1000)
+    old, new = store.get("old"), store.get("new")
+    _fill_cache(old, 600)
+    _fill_cache(new, 600)
+    store.commit(new)
+
+    assert old.kv_state["past_key_values"] is None
+    assert old.kv_state["nbytes"] == 0
+    assert new.kv_state["nbytes"] == 600
+    assert store.total_kv_bytes() == 600
+
+def test_turns_on_same_session_are_serialized():
+    store = _store()
+    session = store.get("a")
+    order = []
+
+    def second_turn():
+        with store.turn(session):
+            order.append("second")
+
+    with store.turn(session):
+        worker = threading.Thread(target=second_turn)
+        worker.start()
+        worker.join(timeout=0.2)
+        assert worker.is_alive()  # 첫 턴이 끝날 때까지 대기
+        order.append("first")
+    worker.join(timeout=1)
+    assert order == ["first", "second"]
+
+def test_turn_times_out_while_previous_turn_runs():
+    store = _store()
+    session = store.get("a")
+    with store.turn(session):
+        with pytest.raises(GenerationRejected):
+            with store.turn(session, timeout=0.05):
+                pass
+    # 거절된 턴은 잠금을 풀지 않으므로 다음 턴은 바로 처리됨
+    with store.turn(session, timeout=0.05):
+        pass
+
+def test_kv_cache_of_running_turn_is_not_freed():
+    store = _store(max_kv_bytes=1000)
+    old, new = store.get("old"), store.get("new")
+    _fill_cache(old, 600)
+    _fill_cache(new, 600)
+    with store.turn(old):
+        store.commit(new)
+        assert old.kv_state["nbytes"] == 600
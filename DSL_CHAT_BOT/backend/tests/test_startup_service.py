@@ -0,0 +1,110 @@
+import numpy as np
+import pandas as pd
+import pytest
+from services.startup_service import StartupService
+
+STATS_COLUMNS = ["연도", "업종구분", "창업률(%)", "폐업률(%)", "1년생존율(%)", "2년생존율(%)", "3년생존율(%)"]
+STATS_ROWS = [
+    [2022, "치킨", 12.0, 9.0, 70.0, 55.0, 45.0],
+    [2023, "치킨", 11.0, 10.5, 68.0, 54.0, None],
+    [2022, "편의점", 8.0, 6.0, 80.0, 65.0, 50.0],
+    [2023, "편의점", 7.5, 6.5, 79.0, None, None],
+]
+BIZ_ROWS = [
+    ["번호", "개방서비스명", "인허가일자", "상세영업상태명", "폐업일자", "사업장명", "업태구분명", "업종구분"],
+    [1, "일반음식점", "20200101", "영업", "", "동성로치킨", "호프/통닭", "치킨"],
+    [2, "휴게음식점", "20210101", "폐업", "20230101", "동성로편의점", "편의점", "편의점"],
+]
+
+class StubEmbedder:
+    """인코딩한 문장을 기록하고 문장마다 고정된 벡터를 돌려줌"""
+    def __init__(self):
+        self.encoded = []
+
+    def encode(self, texts, convert_to_numpy=True, show_progress_bar=False):
+        self.encoded.extend(texts)
+        return np.array([[float(len(text)), float(sum(map(ord, text)) % 997)] for text in texts])
+
+def _write_data(tmp_path, rows):
+    paths = {
+        "startup_data": str(tmp_path / "master_summary_final.csv"),
+        "business_data": str(tmp_path / "final_data.csv")
+    }
+    pd.DataFrame(rows, columns=STATS_COLUMNS).to_csv(paths["startup_data"], index=False, encoding="utf-8")
+    pd.DataFrame(BIZ_ROWS).to_csv(paths["business_data"], index=False, header=False, encoding="utf-8")
+    return paths
+
+@pytest.fixture
+def service(tmp_path, monkeypatch):
+    paths = _write_data(tmp_path, STATS_ROWS)
+    svc = StartupService()
+    svc.embedder = StubEmbedder()
+    monkeypatch.setattr(svc, "region_paths", lambda region: paths if region == svc.default_region else None)
+    return svc
+
+def test_reload_embeds_only_changed_row(service, tmp_path):
+    before = service.regions.get(service.default_region)
+    assert len(service.embedder.encoded) == len(STATS_ROWS) + len(BIZ_ROWS) - 1
+    old_text = before["stats_corpus"][1]
+    old_stats = list(before["sector_stats"]["치킨"])
+    old_embeds = before["stats_embeds"].copy()
+
+    # 치킨 2023 폐업률만 변경
+    rows = [list(row) for row in STATS_ROWS]
+    rows[1][3] = 13.0
+    _write_data(tmp_path, rows)
+    service.embedder.encoded.clear()
+    assert service.reload_region() is True
+
+    after = service.regions.get(service.default_region)
+    new_text = after["stats_corpus"][1]
+    assert service.embedder.encoded == [new_text]
+    assert "폐업률=13.0%" in new_text
+    # 바뀌지 않은 행은 기존 임베딩 재사용
+    unchanged = [0, 2, 3]
+    assert np.array_equal(after["stats_embeds"][unchanged], old_embeds[unchanged])
+
+    assert after["sector_table"]["치킨"][2023]["폐업률(%)"] == 13.0
+    assert new_text in after["sector_stats"]["치킨"]
+    assert old_text not in after["sector_stats"]["치킨"]
+
+    # 재구축 전에 받아 둔 스냅샷은 그대로 (처리 중인 요청은 이전 데이터로 끝남)
+    assert before["stats_corpus"][1] == old_text
+    assert before["sector_stats"]["치킨"] == old_stats
+    assert before["sector_table"]["치킨"][2023]["폐업률(%)"] == 10.5
+    assert np.array_equal(before["stats_embeds"], old_embeds)
+
+def test_reload_without_changes_embeds_nothing(service):
+    before = service.regions.get(service.default_region)
+    service.embedder.encoded.clear()
+    assert service.reload_region() is True
+
+    after = service.regions.get(service.default_region)
+    assert service.embedder.encoded == []
+    assert after is not before
+    assert np.array_equal(after["stats_embeds"], before["stats_embeds"])
+
+def test_partition_reload_uses_disk_embedding_cache(service):
+    service.regions.get(service.default_region)
+
+    # 새 인스턴스(서버 재시작/파티션 재로드)는 디스크 캐시로 임베딩을 복원
+    restarted = StartupService()
+    restarted.embedder = StubEmbedder()
+    restarted.region_paths = service.region_paths
+    snapshot = restarted.regions.get(restarted.default_region)
+    assert restarted.embedder.encoded == []
+    assert len(snapshot["stats_embeds"]) == len(STATS_ROWS)
+
+def test_sector_summary_uses_latest_value_and_calendar_year_delta():
+    df = pd.DataFrame([
+        [2020, "치킨", 10.0, 8.0, 70.0, None, None],
+        [2021, "치킨", 11.0, 9.0, 72.0, None, None],
+        [2023, "치킨", 12.5, 7.5, None, None, None],   # 2022 없음
+        [2022, "편의점", 6.0, 5.0, 80.0, None, None],
+        [2023, "편의점", 7.0, 5.5, 81.5, None, None],
+    ], columns=STATS_COLUMNS)
+    summary = StartupService()._build_sector_summary(df)
+
+    # 최근값은 지표마다 값이 있는 마지막 연도, 전년비는 달력상 바로 앞 연도가 있을 때만
+    assert summary["치킨"] == "창업률 12.5%(2023) / 폐업률 7.5%(2023) / 1년생존율 72.0%(2021, +2.0%p)"
+    assert summary["편의점"] == "창업률 7.0%(2023, +1.0%p) / 폐업률 5.5%(2023, +0.5%p) / 1년생존율 81.5%(2023, +1.5%p)"
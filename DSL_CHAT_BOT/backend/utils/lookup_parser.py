@@ -0,0 +1,53 @@
+import re
+from utils.text_processor import text_processor
+
+# ── LLM 없이 답하는 통계 조회 ("카페 폐업률 알려줘", "2023년 치킨 생존율") ──
+LOOKUP_METRIC_WORDS = {
+    '창업률(%)': ["창업률", "창업율"],
+    '폐업률(%)': ["폐업률", "폐업율"]
+}
+# 조언/판단을 원하는 질문은 LLM 경로로
+ADVICE_WORDS = ["어때", "어떤가", "어떨까", "조언", "전망", "할까", "해도", "괜찮", "추천", "방법", "전략",
+                "왜", "이유", "어떻게", "좋을까", "좋은가", "창업하려", "차리", "준비"]
+# 여러 업종을 견주는 비교/순위 질문도 LLM 경로로 (조회 답변은 업종 1개 기준)
+COMPARE_WORDS = ["비교", "차이", "순위", "높은", "낮은"]
+# 대구/경북 데이터로 답하면 안 되는 다른 지역
+OTHER_REGIONS = ["서울", "부산", "인천", "광주", "대전", "울산", "세종", "경기", "강원",
+                 "충북", "충남", "전북", "전남", "경남", "제주"]
+
+def parse_lookup(question):
+    """단순 통계 조회 질문이면 {metrics, year} 반환, 아니면 None (지역/업종 판단은 StartupService.detect_lookup)"""
+    text = question.replace(" ", "")
+    if any(word in text for word in ADVICE_WORDS + COMPARE_WORDS + OTHER_REGIONS):
+        return None
+    if names_multiple_sectors(question):
+        return None
+
+    metrics = [col for col, words in LOOKUP_METRIC_WORDS.items() if any(w in text for w in words)]
+    survival_years = re.findall(r'([1-3])년생존[율률]', text)
+    if survival_years:
+        metrics += [f"{y}년생존율(%)" for y in dict.fromkeys(survival_years)]
+    elif re.search(r'생존[율률]', text):
+        metrics += ['1년생존율(%)', '2년생존율(%)', '3년생존율(%)']
+    if not metrics:
+        return None
+
+    year_match = re.search(r'((?:19|20)\d{2})년', text)
+    return {"metrics": metrics, "year": int(year_match.group(1)) if year_match else None}
+
+def _sector_mentions(question):
+    """질문에 나온 업종 키워드별 해당 업종 집합 (더 긴 키워드에 포함된 키워드는 제외: 애견카페 ⊃ 카페)"""
+    text = question.lower()
+    found = {}
+    for sector, keywords in text_processor.SYNONYMS.items():
+        for keyword in keywords + [sector]:
+            if keyword.lower() in text:
+                found.setdefault(keyword.lower(), set()).add(sector)
+    return [sectors for keyword, sectors in found.items()
+            if not any(keyword != other and keyword in other for other in found)]
+
+def names_multiple_sectors(question):
+    """서로 다른 업종을 가리키는 키워드가 둘 이상이면 True ("카페랑 치킨"). "카페"처럼 한 키워드가
+    여러 업종에 걸치거나(카페/제과제빵, 보드게임카페) 키워드끼리 같은 업종을 가리키면 업종 1개로 봄"""
+    mentions = _sector_mentions(question)
+    return any(a.isdisjoint(b) for i, a in enumerate(mentions) for b in mentions[i + 1:])
@@ -0,0 +1,34 @@
+from config.settings import PROMPT_BUDGETS
+
+class PromptBudget:
+    def __init__(self):
+        self.budgets = PROMPT_BUDGETS
+
+    def count(self, llm, messages):
+        """채팅 템플릿까지 적용한 실제 입력 토큰 수"""
+        return len(llm.tokenizer.apply_chat_template(messages, tokenize=True, add_generation_prompt=True))
+
+    def fit(self, llm, category, build, items, drop_from_start=False, min_items=1, baseline_tokens=None):
+        """build(items)로 만든 메시지가 예산을 넘으면 items를 하나씩 빼면서 맞춤
+
+        drop_from_start=True면 앞에서부터(오래된 대화), 아니면 뒤에서부터(유사도 낮은 컨텍스트) 제외.
+        baseline_tokens가 있으면 그 대비 절약된 토큰 수를 함께 기록.
+        """
+        budget = self.budgets.get(category)
+        items = list(items)
+        messages = build(items)
+        tokens = self.count(llm, messages)
+        full_tokens = tokens
+
+        while budget is not None and tokens > budget and len(items) > min_items:
+            items = items[1:] if drop_from_start else items[:-1]
+            messages = build(items)
+            tokens = self.count(llm, messages)
+
+        saved = (baseline_tokens if baseline_tokens is not None else full_tokens) - tokens
+        over = " ⚠️ 예산 초과" if budget is not None and tokens > budget else ""
+        print(f"📏 [{category}] 프롬프트 {tokens}토큰 (예산 {budget}, 절약 {saved}){over}")
+        return messages, {"category": category, "prompt_tokens": tokens, "budget": budget, "saved_tokens": saved}
+
+# 전역 인스턴스
+prompt_budget = PromptBudget()
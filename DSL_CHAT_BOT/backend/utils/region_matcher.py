@@ -0,0 +1,29 @@
+import re
+from config.constants import REGIONS
+
+def _alias_pattern(alias):
+    # 단어 시작 위치에서만 매칭 (강남구 → 남구 X), 별칭 안의 띄어쓰기는 있어도 없어도 됨 (대구중구 = 대구 중구)
+    return re.compile(r"(?<![가-힣A-Za-z0-9])" + r"\s*".join(re.escape(part) for part in alias.split()))
+
+# (지역명, 별칭 길이, 패턴)
+REGION_PATTERNS = [
+    (region, len(alias.replace(" ", "")), _alias_pattern(alias))
+    for region, info in REGIONS.items() for alias in info["aliases"]
+]
+
+def match_region(text):
+    """텍스트에 언급된 지역명 (여러 개면 더 긴 별칭 우선: 달서구 > 서구). 없으면 None"""
+    best_region, best_len = None, 0
+    for region, alias_len, pattern in REGION_PATTERNS:
+        if alias_len > best_len and pattern.search(text):
+            best_region, best_len = region, alias_len
+    return best_region
+
+def mentioned_regions(text):
+    """지역명/별칭이 들어 있기만 해도 언급으로 보는 느슨한 검사 (안동, 상주처럼 접미사 없는 이름 포함).
+    오탐이 있어도 안전한 쪽(LLM 경로로 넘기기)으로만 사용"""
+    text = text.replace(" ", "")
+    return {
+        region for region, info in REGIONS.items()
+        if any(name.replace(" ", "") in text for name in [region] + info["aliases"])
+    }
@@ -0,0 +1,33 @@
+import time
+import threading
+from contextlib import contextmanager
+from contextvars import ContextVar
+
+class GenerationRejected(Exception):
+    """마감 시간 안에 생성을 끝낼 수 없거나 이미 취소된 요청"""
+    pass
+
+class RequestContext:
+    def __init__(self, timeout_sec):
+        self.deadline = time.monotonic() + timeout_sec
+        self.cancelled = threading.Event()  # 클라이언트 연결 끊김 시 set
+
+    def remaining(self):
+        return self.deadline - time.monotonic()
+
+    def should_stop(self):
+        return self.cancelled.is_set() or self.remaining() <= 0
+
+_current_request = ContextVar("current_request", default=None)
+
+def current_request():
+    """현재 스레드/태스크에서 처리 중인 요청 컨텍스트 (없으면 None → 마감 없음)"""
+    return _current_request.get()
+
+@contextmanager
+def request_scope(ctx):
+    token = _current_request.set(ctx)
+    try:
+        yield ctx
+    finally:
+        _current_request.reset(token)
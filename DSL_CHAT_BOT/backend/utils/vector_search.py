@@ -0,0 +1,9 @@
+import numpy as np
+
+def top_k(q_embs, embeds, k):
+    """질문 임베딩 행렬 (질문 수, 차원)과 문서 임베딩의 유사도를 행렬곱 1회로 계산
+
+    반환: (질문별 상위 k개 인덱스 (유사도 내림차순), 전체 유사도 행렬)
+    """
+    sims = np.dot(q_embs, embeds.T)  # (질문 수, 문서 수)
+    return sims.argsort(axis=1)[:, -k:][:, ::-1], sims
@@ -5,20 +5,33 @@
 
 const fetch = require('node-fetch');
 
+// Netlify 함수 실행 제한(기본 10초)보다 조금 짧게 잡아서 백엔드에 마감 시간으로 전달
+const FUNCTION_TIMEOUT_MS = Number(process.env.FUNCTION_TIMEOUT_MS || 9000);
+
 exports.handler = async (event) => {
   try {
     // 클라이언트에서 전달된 데이터 파싱
-    const { message, category } = JSON.parse(event.body);
+    const { message, category, session_id } = JSON.parse(event.body);
     
     // 환경 변수에서 실제 API URL 가져오기
     const API_URL = process.env.REACT_APP_API_URL;
     
+    // 마감 시간이 지나면 연결을 끊어서 백엔드도 생성을 중단하도록 함
+    const controller = new AbortController();
+    const timer = setTimeout(() => controller.abort(), FUNCTION_TIMEOUT_MS);
+
     // 실제 백엔드 API 호출
-    const response = await fetch(`${API_URL}/api/chat`, {
-      method: 'POST',
-      headers: { 'Content-Type': 'application/json' },
-      body: JSON.stringify({ message, category })
-    });
+    let response;
+    try {
+      response = await fetch(`${API_URL}/api/chat`, {
+        method: 'POST',
+        headers: { 'Content-Type': 'application/json' },
+        body: JSON.stringify({ message, category, session_id, timeout_ms: FUNCTION_TIMEOUT_MS }),
+        signal: controller.signal
+      });
+    } finally {
+      clearTimeout(timer);
+    }
 
     const data = await response.json();
     
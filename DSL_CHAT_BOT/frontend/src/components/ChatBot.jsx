@@ -90,6 +90,10 @@ export default function ChatBot() {
   const [loading, setLoading] = useState(false);
   const [inputNotice, setInputNotice] = useState("");
   const [isFirstTime, setIsFirstTime] = useState(true);
+  // 멀티턴 대화용 세션 id (새로고침 전까지 유지)
+  const [sessionId] = useState(() =>
+    window.crypto?.randomUUID ? window.crypto.randomUUID() : `${Date.now()}-${Math.random().toString(36).slice(2)}`
+  );
   useEffect(() => {
     document.body.setAttribute("data-theme", theme);
     document.getElementById("root")?.setAttribute("data-theme", theme);
@@ -162,6 +166,7 @@ export default function ChatBot() {
         body: JSON.stringify({
           message: msg,
           category: selectedCategory ? CATEGORY_DATA[selectedCategory].value : null,
+          session_id: sessionId,
         }),
       });
       